@@ -65,7 +65,7 @@ class ConnectionManager:
             if conn is None:
                 # This case can happen if the URI is valid but the hypervisor is not running
                 raise libvirt.libvirtError(f"libvirt.open('{uri}') returned None")
-            
+
             with self._lock:
                 self.connections[uri] = conn
                 if uri in self.connection_errors:
@@ -80,6 +80,22 @@ class ConnectionManager:
                     del self.connections[uri]  # Clean up failed connection attempt
             return None
 
+    def acquire(self, uri: str) -> libvirt.virConnect | None:
+        """
+        Hands out a connection for the given URI, reusing a pooled one when it is still alive.
+        """
+        return self.connect(uri)
+
+    def release(self, uri: str) -> None:
+        """
+        Returns a connection to the pool without closing it, so a later
+        acquire() on the same URI does not pay the connection setup again.
+        Use disconnect() or disconnect_all() to actually close it.
+        """
+        with self._lock:
+            if uri in self.connections:
+                logging.info(f"Released connection to {uri} back to the pool")
+
     def disconnect(self, uri: str) -> bool:
         """
         Closes and removes a specific connection from the manager.
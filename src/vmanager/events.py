@@ -30,3 +30,16 @@ class VmActionRequest(Message):
         self.vm_uuid = vm_uuid
         self.action = action
         self.delete_storage = delete_storage
+
+
+class VmStatsUpdate(Message):
+    """Sent by the app to a VM card with a freshly polled stats sample."""
+
+    bubble = False
+
+    def __init__(self, uuid: str, stats: dict | None, ip_addresses: list, boot_device: str) -> None:
+        super().__init__()
+        self.uuid = uuid
+        self.stats = stats
+        self.ip_addresses = ip_addresses
+        self.boot_device = boot_device
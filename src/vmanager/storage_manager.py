@@ -9,7 +9,7 @@ import tempfile
 import xml.etree.ElementTree as ET
 import libvirt
 import threading
-from vm_queries import get_vm_disks_info
+from vm_queries import get_vm_disks_info, _parse_domain_xml
 
 def list_storage_pools(conn: libvirt.virConnect) -> List[Dict[str, Any]]:
     """
@@ -544,8 +544,8 @@ def list_unused_volumes(conn: libvirt.virConnect, pool_name: str = None) -> List
     try:
         domains = conn.listAllDomains(0)
         for domain in domains:
-            xml_content = domain.XMLDesc(0)
-            disks_info = get_vm_disks_info(conn, xml_content)
+            root = _parse_domain_xml(domain.XMLDesc(0))
+            disks_info = get_vm_disks_info(conn, root)
             for disk in disks_info:
                 if disk.get('path'):
                     used_disk_paths.add(disk['path'])
@@ -2,7 +2,7 @@
 Utils functions
 """
 import logging
-from functools import wraps
+from functools import lru_cache, wraps
 import socket
 import subprocess
 from pathlib import Path
@@ -12,6 +12,24 @@ from typing import List, Tuple, Union
 from constants import AppInfo
 
 
+def is_port_free(port: int) -> bool:
+    """
+    Check if a local TCP port can be bound.
+
+    Args:
+        port (int): Port number to test
+
+    Returns:
+        bool: True if the port is free, False otherwise
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(('', port))
+            return True
+    except OSError:
+        return False
+
+
 def find_free_port(start: int, end: int) -> int:
     """
     Find a free port in the specified range.
@@ -35,12 +53,8 @@ def find_free_port(start: int, end: int) -> int:
         raise ValueError("Start port must be less than or equal to end port")
 
     for port in range(start, end + 1):
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(('', port))
-                return port
-        except OSError:
-            continue
+        if is_port_free(port):
+            return port
     raise IOError(f"Could not find a free port in the range {start}-{end}")
 
 
@@ -232,6 +246,7 @@ def check_is_firewalld_running() -> Union[str, bool]:
         return False
 
 
+@lru_cache(maxsize=32)
 def extract_server_name_from_uri(server_name: str) -> str:
     """
     Extract server name from URI for display.
@@ -6,6 +6,7 @@ import secrets
 import uuid
 import logging
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 import libvirt
 from libvirt_utils import _find_vol_by_path, _get_disabled_disks_elem
 from utils import log_function_call
@@ -1686,10 +1687,12 @@ def force_off_vm(domain: libvirt.virDomain):
 
     domain.destroy()
 
-def delete_vm(domain: libvirt.virDomain, delete_storage: bool, delete_nvram: bool = False, log_callback=None):
+def delete_vm(domain: libvirt.virDomain, delete_storage: bool, delete_nvram: bool = False, log_callback=None,
+              xml_desc: str | None = None):
     """
     Deletes a VM and optionally its associated storage and NVRAM.
     If the VM has snapshots, their metadata will be removed as well.
+    xml_desc can be passed when the caller already fetched the domain XML.
     """
     if not domain:
         raise ValueError("Invalid domain object.")
@@ -1715,12 +1718,15 @@ def delete_vm(domain: libvirt.virDomain, delete_storage: bool, delete_nvram: boo
     conn = domain.connect()
 
     disks_to_delete = []
-    xml_desc = None
+    root = None
     if delete_storage or delete_nvram:
         try:
-            xml_desc = domain.XMLDesc(0)
+            if xml_desc is None:
+                xml_desc = domain.XMLDesc(0)
+            # Parsed once for both the disks and the NVRAM lookups
+            root = ET.fromstring(xml_desc)
             if delete_storage:
-                disks_to_delete = get_vm_disks_info(conn, xml_desc)
+                disks_to_delete = get_vm_disks_info(conn, root)
         except libvirt.libvirtError as e:
             log(f"[red]ERROR:[/] Could not get XML description for '{vm_name}': {e}")
             raise
@@ -1737,8 +1743,7 @@ def delete_vm(domain: libvirt.virDomain, delete_storage: bool, delete_nvram: boo
     # Undefine the VM
     log(f"Undefining VM '{vm_name}'...")
     undefine_flags = libvirt.VIR_DOMAIN_UNDEFINE_SNAPSHOTS_METADATA
-    if delete_nvram and xml_desc:
-        root = ET.fromstring(xml_desc)
+    if delete_nvram and root is not None:
         os_elem = root.find('os')
         if os_elem is not None and os_elem.find('nvram') is not None:
             log("...including NVRAM.")
@@ -1761,28 +1766,34 @@ def delete_vm(domain: libvirt.virDomain, delete_storage: bool, delete_nvram: boo
         else:
             log(f"Deleting {len(disks_to_delete)} storage volume(s)...")
 
-        for disk_info in disks_to_delete:
-            disk_path = disk_info.get('path')
-            if not disk_path or not disk_info.get('status') == 'enabled':
-                continue
-
-            log(f"Attempting to delete volume: {disk_path}")
+        def delete_volume(disk_path):
+            """Deletes the volume of a disk and returns the message to log."""
             try:
                 vol, pool = _find_vol_by_path(conn, disk_path)
 
                 if vol:
                     vol.delete(0)
-                    log(f"  - Deleted: {disk_path} from pool {pool.name()}")
-                else:
-                    log(f"  - [yellow]Skipped:[/] Disk '{disk_path}' is not a managed libvirt volume.")
+                    return f"  - Deleted: {disk_path} from pool {pool.name()}"
+                return f"  - [yellow]Skipped:[/] Disk '{disk_path}' is not a managed libvirt volume."
 
             except libvirt.libvirtError as e:
                 if e.get_error_code() == libvirt.VIR_ERR_NO_STORAGE_VOL:
-                    log(f"  - [yellow]Skipped:[/] Volume for path '{disk_path}' not found.")
-                else:
-                    log(f"  - [red]ERROR:[/] Error deleting volume for path {disk_path}: {e}")
+                    return f"  - [yellow]Skipped:[/] Volume for path '{disk_path}' not found."
+                return f"  - [red]ERROR:[/] Error deleting volume for path {disk_path}: {e}"
             except Exception as e:
-                log(f"  - [red]ERROR:[/] Unexpected error deleting storage {disk_path}: {e}")
+                return f"  - [red]ERROR:[/] Unexpected error deleting storage {disk_path}: {e}"
+
+        disk_paths = [
+            disk_info.get('path') for disk_info in disks_to_delete
+            if disk_info.get('path') and disk_info.get('status') == 'enabled'
+        ]
+        for disk_path in disk_paths:
+            log(f"Attempting to delete volume: {disk_path}")
+        if disk_paths:
+            # Volumes on slow storage can take seconds each, delete them concurrently
+            with ThreadPoolExecutor(max_workers=min(8, len(disk_paths))) as executor:
+                for message in executor.map(delete_volume, disk_paths):
+                    log(message)
 
     log(f"Finished deletion process for VM '{vm_name}'.")
 
@@ -2052,10 +2063,12 @@ def create_vm_snapshot(domain: libvirt.virDomain, name: str, description: str =
     """
     invalidate_cache(domain.UUIDString())
 
-    xml = f"<domainsnapshot><name>{name}</name>"
+    # Built with ElementTree so that '<', '&' and quotes in the name or description are escaped
+    snapshot_elem = ET.Element('domainsnapshot')
+    ET.SubElement(snapshot_elem, 'name').text = name
     if description:
-        xml += f"<description>{description}</description>"
-    xml += "</domainsnapshot>"
+        ET.SubElement(snapshot_elem, 'description').text = description
+    xml = ET.tostring(snapshot_elem, encoding='unicode')
 
     try:
         domain.snapshotCreateXML(xml, 0)
@@ -19,7 +19,7 @@ def get_from_cache(uuid: str) -> Optional[Dict[str, Any]]:
     with _lock:
         if uuid in _cache:
             entry = _cache[uuid]
-            if time.time() - entry['timestamp'] < TTL:
+            if time.monotonic() - entry['timestamp'] < TTL:
                 return entry['data']
             else:
                 # Clean up expired entry
@@ -33,7 +33,7 @@ def set_in_cache(uuid: str, data: Dict[str, Any]):
     with _lock:
         _cache[uuid] = {
             'data': data,
-            'timestamp': time.time()
+            'timestamp': time.monotonic()
         }
 
 def clear_cache():
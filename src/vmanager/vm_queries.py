@@ -136,6 +136,11 @@ def get_vm_network_dns_gateway_info(domain: libvirt.virDomain, root=None):
 
     return network_details
 
+_STATUS_BY_STATE = {
+    libvirt.VIR_DOMAIN_RUNNING: 'Running',
+    libvirt.VIR_DOMAIN_PAUSED: 'Paused',
+}
+
 def get_status(domain, state=None):
     """
     state of a VM
@@ -146,12 +151,7 @@ def get_status(domain, state=None):
         except libvirt.libvirtError:
             return 'Unknown'
 
-    if state == libvirt.VIR_DOMAIN_RUNNING:
-        return 'Running'
-    elif state == libvirt.VIR_DOMAIN_PAUSED:
-        return 'Paused'
-    else:
-        return 'Stopped'
+    return _STATUS_BY_STATE.get(state, 'Stopped')
 
 def get_vm_description(domain):
     """
@@ -41,7 +41,7 @@ class VMService:
 
     def _update_domain_cache(self, active_uris: list[str], force: bool = False):
         """Updates the domain and connection cache."""
-        if not force and self._domain_cache and (time.time() - self._cache_timestamp < self._cache_ttl):
+        if not force and self._domain_cache and (time.monotonic() - self._cache_timestamp < self._cache_ttl):
             return
 
         self.invalidate_domain_cache()
@@ -57,12 +57,12 @@ class VMService:
                     self._uuid_to_conn_cache[uuid] = conn
             except libvirt.libvirtError:
                 pass  # Or log error
-        self._cache_timestamp = time.time()
+        self._cache_timestamp = time.monotonic()
 
     def _get_domain_info_and_xml(self, domain: libvirt.virDomain) -> tuple[tuple, str]:
         """Gets info and XML from cache or fetches them, fetching both if both are missing."""
         uuid = domain.UUIDString()
-        now = time.time()
+        now = time.monotonic()
 
         # Ensure cache entry exists
         self._vm_data_cache.setdefault(uuid, {})
@@ -99,7 +99,7 @@ class VMService:
     def _get_domain_info(self, domain: libvirt.virDomain) -> tuple | None:
         """Gets domain info from cache or fetches it."""
         uuid = domain.UUIDString()
-        now = time.time()
+        now = time.monotonic()
 
         self._vm_data_cache.setdefault(uuid, {})
         vm_cache = self._vm_data_cache[uuid]
@@ -119,7 +119,7 @@ class VMService:
     def _get_domain_xml(self, domain: libvirt.virDomain) -> str | None:
         """Gets domain XML from cache or fetches it."""
         uuid = domain.UUIDString()
-        now = time.time()
+        now = time.monotonic()
 
         self._vm_data_cache.setdefault(uuid, {})
         vm_cache = self._vm_data_cache[uuid]
@@ -137,53 +137,88 @@ class VMService:
         return xml
 
 
+    def _build_runtime_stats(self, uuid: str, status: str, cpu_time: int, num_cpus: int,
+                             rss_kb: int | None, total_mem_kb: int, io_bytes: tuple, now: float) -> dict:
+        """Turns raw counters into usage percentages and I/O rates, using the
+        previous sample of the VM to compute the deltas."""
+        stats = {'status': status}
+
+        # CPU Usage
+        cpu_percent = 0.0
+        if uuid in self._cpu_time_cache:
+            last_cpu_time, last_cpu_time_ts = self._cpu_time_cache[uuid]
+            time_diff = now - last_cpu_time_ts
+            cpu_diff = cpu_time - last_cpu_time
+            if time_diff > 0 and num_cpus > 0:
+                # nanoseconds to seconds, to percent and per cpu, in a single division
+                cpu_percent = cpu_diff / (time_diff * 10_000_000 * num_cpus)
+
+        stats['cpu_percent'] = cpu_percent
+        self._cpu_time_cache[uuid] = (cpu_time, now)
+
+        # Memory Usage
+        mem_percent = 0.0
+        if rss_kb is not None and total_mem_kb > 0:
+            mem_percent = (rss_kb / total_mem_kb) * 100
+        stats['mem_percent'] = mem_percent
+
+        # Calculate I/O Rates
+        disk_read_bytes, disk_write_bytes, net_rx_bytes, net_tx_bytes = io_bytes
+        disk_read_rate = 0.0
+        disk_write_rate = 0.0
+        net_rx_rate = 0.0
+        net_tx_rate = 0.0
+
+        if uuid in self._io_stats_cache:
+            last_stats = self._io_stats_cache[uuid]
+            last_ts = last_stats['ts']
+            time_diff = now - last_ts
+
+            if time_diff > 0:
+                # Prevent negative rates if counters reset
+                d_read = disk_read_bytes - last_stats['disk_read']
+                d_write = disk_write_bytes - last_stats['disk_write']
+                n_rx = net_rx_bytes - last_stats['net_rx']
+                n_tx = net_tx_bytes - last_stats['net_tx']
+
+                disk_read_rate = d_read / time_diff if d_read >= 0 else 0
+                disk_write_rate = d_write / time_diff if d_write >= 0 else 0
+                net_rx_rate = n_rx / time_diff if n_rx >= 0 else 0
+                net_tx_rate = n_tx / time_diff if n_tx >= 0 else 0
+
+        # Store cache
+        self._io_stats_cache[uuid] = {
+            'ts': now,
+            'disk_read': disk_read_bytes,
+            'disk_write': disk_write_bytes,
+            'net_rx': net_rx_bytes,
+            'net_tx': net_tx_bytes
+        }
+
+        stats['disk_read_kbps'] = disk_read_rate / 1024
+        stats['disk_write_kbps'] = disk_write_rate / 1024
+        stats['net_rx_kbps'] = net_rx_rate / 1024
+        stats['net_tx_kbps'] = net_tx_rate / 1024
+
+        return stats
+
     def get_vm_runtime_stats(self, domain: libvirt.virDomain) -> dict | None:
         """Gets live statistics for a given, active VM domain."""
         from vm_queries import get_status
-        from datetime import datetime
 
         if not domain or not domain.isActive():
             return None
 
         uuid = domain.UUIDString()
-        stats = {}
         try:
-            # Status
-            stats['status'] = get_status(domain)
-
-            # CPU Usage
+            status = get_status(domain)
             cpu_stats = domain.getCPUStats(True)
             current_cpu_time = cpu_stats[0]['cpu_time']
-            now = datetime.now().timestamp()
-
-            cpu_percent = 0.0
-            if uuid in self._cpu_time_cache:
-                last_cpu_time, last_cpu_time_ts = self._cpu_time_cache[uuid]
-                time_diff = now - last_cpu_time_ts
-                cpu_diff = current_cpu_time - last_cpu_time
-                if time_diff > 0:
-                    info = self._get_domain_info(domain)
-                    if not info: return None
-                    num_cpus = info[3]
-                    # nanoseconds to seconds, then divide by number of cpus
-                    cpu_percent = (cpu_diff / (time_diff * 1_000_000_000)) * 100
-                    cpu_percent = cpu_percent / num_cpus if num_cpus > 0 else 0
-
-            stats['cpu_percent'] = cpu_percent
-            self._cpu_time_cache[uuid] = (current_cpu_time, now)
-
-            # Memory Usage
-            mem_stats = domain.memoryStats()
-            mem_percent = 0.0
-            if 'rss' in mem_stats:
-                info = self._get_domain_info(domain)
-                if not info: return None
-                total_mem_kb = info[1]
-                if total_mem_kb > 0:
-                    rss_kb = mem_stats['rss']
-                    mem_percent = (rss_kb / total_mem_kb) * 100
+            now = time.monotonic()
 
-            stats['mem_percent'] = mem_percent
+            info = self._get_domain_info(domain)
+            if not info: return None
+            mem_stats = domain.memoryStats()
 
             # Disk and Network I/O
             disk_read_bytes = 0
@@ -227,7 +262,6 @@ class VMService:
                                     devices_list['interfaces'].append(dev)
                     except ET.ParseError:
                         pass
-
                 vm_cache['devices_list'] = devices_list
                 vm_cache['devices_ts'] = current_xml_ts
 
@@ -250,44 +284,10 @@ class VMService:
                 except libvirt.libvirtError:
                     pass
 
-            # Calculate I/O Rates
-            disk_read_rate = 0.0
-            disk_write_rate = 0.0
-            net_rx_rate = 0.0
-            net_tx_rate = 0.0
-
-            if uuid in self._io_stats_cache:
-                last_stats = self._io_stats_cache[uuid]
-                last_ts = last_stats['ts']
-                time_diff = now - last_ts
-
-                if time_diff > 0:
-                    # Prevent negative rates if counters reset
-                    d_read = disk_read_bytes - last_stats['disk_read']
-                    d_write = disk_write_bytes - last_stats['disk_write']
-                    n_rx = net_rx_bytes - last_stats['net_rx']
-                    n_tx = net_tx_bytes - last_stats['net_tx']
-
-                    disk_read_rate = d_read / time_diff if d_read >= 0 else 0
-                    disk_write_rate = d_write / time_diff if d_write >= 0 else 0
-                    net_rx_rate = n_rx / time_diff if n_rx >= 0 else 0
-                    net_tx_rate = n_tx / time_diff if n_tx >= 0 else 0
-
-            # Store cache
-            self._io_stats_cache[uuid] = {
-                'ts': now,
-                'disk_read': disk_read_bytes,
-                'disk_write': disk_write_bytes,
-                'net_rx': net_rx_bytes,
-                'net_tx': net_tx_bytes
-            }
-
-            stats['disk_read_kbps'] = disk_read_rate / 1024
-            stats['disk_write_kbps'] = disk_write_rate / 1024
-            stats['net_rx_kbps'] = net_rx_rate / 1024
-            stats['net_tx_kbps'] = net_tx_rate / 1024
-
-            return stats
+            return self._build_runtime_stats(
+                uuid, status, current_cpu_time, info[3], mem_stats.get('rss'), info[1],
+                (disk_read_bytes, disk_write_bytes, net_rx_bytes, net_tx_bytes), now
+            )
 
         except libvirt.libvirtError as e:
             if e.get_error_code() == libvirt.VIR_ERR_NO_DOMAIN:
@@ -298,10 +298,56 @@ class VMService:
                     del self._io_stats_cache[uuid]
             return None
 
+    def get_vms_runtime_stats(self, conn: libvirt.virConnect, domains: list[libvirt.virDomain],
+                              vcpu_counts: dict[str, int] | None = None) -> dict[str, dict | None]:
+        """Gets live statistics for several domains of one connection with a single
+        stats RPC. Returns {uuid: stats}, with None for inactive domains.
+        When the caller knows the vCPU counts ({uuid: count}), the per-vCPU
+        stats are not requested; they are only used for that count."""
+        from vm_queries import get_status
+
+        stats_flags = (libvirt.VIR_DOMAIN_STATS_STATE | libvirt.VIR_DOMAIN_STATS_CPU_TOTAL |
+                       libvirt.VIR_DOMAIN_STATS_BALLOON |
+                       libvirt.VIR_DOMAIN_STATS_BLOCK | libvirt.VIR_DOMAIN_STATS_INTERFACE)
+        if vcpu_counts is None:
+            stats_flags |= libvirt.VIR_DOMAIN_STATS_VCPU
+            vcpu_counts = {}
+        inactive_states = (libvirt.VIR_DOMAIN_NOSTATE, libvirt.VIR_DOMAIN_SHUTOFF, libvirt.VIR_DOMAIN_CRASHED)
+
+        results = {}
+        now = time.monotonic()
+        for domain, params in conn.domainListGetStats(domains, stats_flags, 0):
+            uuid = domain.UUIDString()
+            state = params.get('state.state', libvirt.VIR_DOMAIN_NOSTATE)
+            if state in inactive_states:
+                results[uuid] = None
+                continue
+
+            io_bytes = (
+                sum(params.get(f'block.{i}.rd.bytes', 0) for i in range(params.get('block.count', 0))),
+                sum(params.get(f'block.{i}.wr.bytes', 0) for i in range(params.get('block.count', 0))),
+                sum(params.get(f'net.{i}.rx.bytes', 0) for i in range(params.get('net.count', 0))),
+                sum(params.get(f'net.{i}.tx.bytes', 0) for i in range(params.get('net.count', 0))),
+            )
+            results[uuid] = self._build_runtime_stats(
+                uuid, get_status(domain, state), params.get('cpu.time', 0),
+                vcpu_counts.get(uuid) or params.get('vcpu.current', 0),
+                params.get('balloon.rss'), params.get('balloon.maximum', 0), io_bytes, now
+            )
+        return results
+
     def connect(self, uri: str) -> libvirt.virConnect | None:
         """Connects to a libvirt URI."""
         return self.connection_manager.connect(uri)
 
+    def acquire(self, uri: str) -> libvirt.virConnect | None:
+        """Gets a pooled libvirt connection for a URI, opening it if needed."""
+        return self.connection_manager.acquire(uri)
+
+    def release(self, uri: str) -> None:
+        """Returns a libvirt connection to the pool without closing it."""
+        self.connection_manager.release(uri)
+
     def disconnect(self, uri: str) -> None:
         """Disconnects from a libvirt URI."""
         self.connection_manager.disconnect(uri)
@@ -5,6 +5,7 @@ import os
 import sys
 import logging
 import argparse
+from collections import deque
 from typing import Any, Callable
 import libvirt
 
@@ -21,7 +22,7 @@ from constants import (
         VmAction, VmStatus, ButtonLabels, ButtonIds,
         ErrorMessages, AppInfo
         )
-from events import VmActionRequest, VMNameClicked, VMSelectionChanged
+from events import VmActionRequest, VMNameClicked, VMSelectionChanged, VmStatsUpdate
 from libvirt_error_handler import register_error_handler
 from libvirt_utils import _get_vm_names_from_uuids
 from modals.bulk_modals import BulkActionModal
@@ -186,7 +187,11 @@ class VMManagerTUI(App):
         self.ui = {}
         self.devel = "(Devel v" + AppInfo.version + ")"
         self.vm_cards: dict[str, VMCard] = {}
+        self._mounted_cards: dict[str, VMCard] = {}
+        self._last_pagination_state = None
+        self._selected_uuids_tuple: tuple[str, ...] = ()
         self._resize_timer = None
+        self._stats_timer = None
 
     def get_server_color(self, uri: str) -> str:
         """Assigns and returns a consistent color for a given server URI."""
@@ -301,6 +306,58 @@ class VMManagerTUI(App):
             self.connect_libvirt(uri)
         # self.refresh_vm_list()
 
+        self._poll_all_stats()
+
+    def _poll_all_stats(self) -> None:
+        """Polls the stats of all displayed VMs with one libvirt call per server
+        and sends each sample to its VM card."""
+        # Schedule next update
+        interval = self.config.get('STATS_INTERVAL', 5)
+        self._stats_timer = self.set_timer(interval, self._poll_all_stats)
+
+        cards_by_conn: dict[libvirt.virConnect, list[tuple[str, VMCard]]] = {}
+        for uuid, card in self._mounted_cards.items():
+            if card.is_mounted and card.vm and card.conn:
+                cards_by_conn.setdefault(card.conn, []).append((uuid, card))
+        if not cards_by_conn:
+            return
+        if self.worker_manager.is_running("poll_all_stats"):
+            # A slow host is still answering the previous poll, skip this tick
+            return
+
+        def poll_worker():
+            for conn, cards in cards_by_conn.items():
+                try:
+                    all_stats = self.vm_service.get_vms_runtime_stats(
+                        conn, [card.vm for _, card in cards], {uuid: card.cpu for uuid, card in cards}
+                    )
+                except libvirt.libvirtError as e:
+                    if e.get_error_code() == libvirt.VIR_ERR_NO_DOMAIN:
+                        # A displayed VM is gone, the list needs a refresh
+                        self.call_from_thread(self.refresh_vm_list)
+                    else:
+                        logging.warning(f"Libvirt error during stats polling: {e}")
+                    continue
+                except Exception as e:
+                    logging.error(f"Unexpected error during stats polling: {e}", exc_info=True)
+                    continue
+
+                for uuid, card in cards:
+                    stats = all_stats.get(uuid)
+                    try:
+                        ips, boot_dev = card.collect_extra_stats(stats)
+                    except libvirt.libvirtError as e:
+                        logging.warning(f"Libvirt error during stat update for {card.name}: {e}")
+                        continue
+                    except Exception as e:
+                        logging.error(f"Unexpected error during stat update for {card.name}: {e}", exc_info=True)
+                        continue
+                    self.call_from_thread(card.post_message, VmStatsUpdate(uuid, stats, ips, boot_dev))
+
+        self.worker_manager.run(
+            poll_worker, name="poll_all_stats", group="stats_poll", exclusive=False
+        )
+
     def _update_layout_for_size(self):
         """Update the layout based on the terminal size."""
         vms_container = self.ui.get("vms_container")
@@ -604,8 +661,16 @@ class VMManagerTUI(App):
                     self.call_from_thread(self.show_error_message, f"Unknown action '{message.action}' requested.")
                     return
 
-                # If action was successful, refresh the list
-                self.call_from_thread(self.refresh_vm_list)
+                if message.action == VmAction.DELETE or self.sort_by not in (VmStatus.DEFAULT, VmStatus.SELECTED):
+                    # The VM may leave the displayed list, refresh it
+                    self.call_from_thread(self.refresh_vm_list)
+                else:
+                    # Only this VM changed: update its card in place, the stats
+                    # poller picks up later transitions such as a completed shutdown
+                    self.vm_service.invalidate_vm_cache(message.vm_uuid)
+                    card = self._mounted_cards.get(message.vm_uuid)
+                    if card:
+                        self.call_from_thread(card.apply_state, get_status(domain))
 
             except Exception as e:
                 self.call_from_thread(
@@ -638,6 +703,7 @@ class VMManagerTUI(App):
             self.selected_vm_uuids.add(message.vm_uuid)
         else:
             self.selected_vm_uuids.discard(message.vm_uuid)
+        self._selected_uuids_tuple = tuple(self.selected_vm_uuids)
 
     def handle_create_vm_result(self, result: dict | None) -> None:
         """Handle the result from the CreateVMModal and create the VM."""
@@ -685,10 +751,11 @@ class VMManagerTUI(App):
             self.show_error_message("No action type received from bulk action modal.")
             return
 
-        selected_uuids_copy = list(self.selected_vm_uuids)  # Take a copy for the worker
+        selected_uuids_copy = list(self._selected_uuids_tuple)  # Take a copy for the worker
 
         # Clear selection immediately and set bulk operation flag
         self.selected_vm_uuids.clear()
+        self._selected_uuids_tuple = ()
         self.bulk_operation_in_progress = True
 
         # Perform the action in a worker to avoid blocking the UI
@@ -770,12 +837,11 @@ class VMManagerTUI(App):
         paginated_domains = domains_to_display[start_index:end_index]
 
         cards_to_mount = []
-        page_uuids = set()
+        page_uuids = []
 
         for domain, conn in paginated_domains:
             try:
                 uuid = domain.UUIDString()
-                page_uuids.add(uuid)
                 is_vm_selected = uuid in self.selected_vm_uuids
                 
                 vm_card = self.vm_cards.get(uuid)
@@ -810,7 +876,9 @@ class VMManagerTUI(App):
                 else:
                     # Create new card
                     if uuid not in self.sparkline_data:
-                        self.sparkline_data[uuid] = {"cpu": [], "mem": [], "disk": [], "net": []}
+                        self.sparkline_data[uuid] = {
+                            key: deque(maxlen=20) for key in ("cpu", "mem", "disk", "net")
+                        }
 
                     vm_card = VMCard(is_selected=is_vm_selected)
                     vm_card.name = domain.name()
@@ -824,6 +892,7 @@ class VMManagerTUI(App):
                     vm_card.cpu_model = cpu_details or ""
                     self.vm_cards[uuid] = vm_card
 
+                page_uuids.append(uuid)
                 cards_to_mount.append(vm_card)
             except libvirt.libvirtError as e:
                 if e.get_error_code() == libvirt.VIR_ERR_NO_DOMAIN:
@@ -857,17 +926,26 @@ class VMManagerTUI(App):
             if not vms_container:
                 return
 
-            # Remove cards from container that are not in the new page layout
-            for card in vms_container.query(VMCard):
-                try:
-                    # card.vm might be None if domain died
-                    if not card.vm or card.vm.UUIDString() not in page_uuids:
+            # Only touch the delta: cards already on screen are updated in place
+            # through their reactive attributes, so they are neither removed nor remounted.
+            new_uuids = set(page_uuids)
+            for uuid in list(self._mounted_cards):
+                card = self._mounted_cards[uuid]
+                if uuid not in new_uuids or not card.is_mounted:
+                    if card.is_mounted:
                         card.remove()
-                except (libvirt.libvirtError, AttributeError):
-                    card.remove() # Stale/bad card
+                    del self._mounted_cards[uuid]
+
+            new_cards = [card for uuid, card in zip(page_uuids, cards_to_mount) if uuid not in self._mounted_cards]
+            if new_cards:
+                vms_container.mount(*new_cards)
+            self._mounted_cards = dict(zip(page_uuids, cards_to_mount))
 
-            # Mount the cards. This will add new ones and re-order existing ones.
-            vms_container.mount(*cards_to_mount)
+            # Keep the on-screen order in sync with the sorted page.
+            if list(vms_container.children) != cards_to_mount:
+                for index, card in enumerate(cards_to_mount):
+                    if index > 0:
+                        vms_container.move_child(card, after=cards_to_mount[index - 1])
 
             self.sub_title = f"Servers: {', '.join(server_names)} | Total VMs: {total_vms}"
             self.update_pagination_controls(total_filtered_vms, total_vms_unfiltered=len(domains_to_display))
@@ -880,6 +958,12 @@ class VMManagerTUI(App):
         if not pagination_controls:
             return
 
+        # Nothing to redraw if the counts and the page did not move since last call
+        pagination_state = (total_filtered_vms, total_vms_unfiltered, self.current_page, self.VMS_PER_PAGE)
+        if pagination_state == self._last_pagination_state:
+            return
+        self._last_pagination_state = pagination_state
+
         if total_vms_unfiltered <= self.VMS_PER_PAGE:
             pagination_controls.styles.display = "none"
             return
@@ -901,19 +985,25 @@ class VMManagerTUI(App):
         if next_button:
             next_button.disabled = self.current_page >= num_pages - 1
 
+    def _go_to_page(self, page: int) -> None:
+        """Switch to the given page, refreshing only if the page actually changes."""
+        page = max(0, min(page, self.num_pages - 1))
+        if page == self.current_page:
+            return
+        self.current_page = page
+        # Domains are served from the VMService domain cache, so paging back
+        # and forth does not hit libvirt again within the cache TTL.
+        self.refresh_vm_list()
+
     @on(Button.Pressed, "#prev-button")
     def action_previous_page(self) -> None:
         """Go to the previous page."""
-        if self.current_page > 0:
-            self.current_page -= 1
-            self.refresh_vm_list()
+        self._go_to_page(self.current_page - 1)
 
     @on(Button.Pressed, "#next-button")
     def action_next_page(self) -> None:
         """Go to the next page."""
-        if self.current_page < self.num_pages - 1:
-            self.current_page += 1
-            self.refresh_vm_list()
+        self._go_to_page(self.current_page + 1)
 
     @on(Button.Pressed, "#bulk_selected_vms")
     def on_bulk_selected_vms_button_pressed(self) -> None:
@@ -925,10 +1015,9 @@ class VMManagerTUI(App):
         def get_names_and_show_modal():
             """Worker to fetch VM names and display the bulk action modal."""
             all_names = set()
-            uuids = list(self.selected_vm_uuids)
-            connections = list(self._get_active_connections())
+            uuids = self._selected_uuids_tuple
 
-            for conn in connections:
+            for conn in self._get_active_connections():
                 try:
                     names = _get_vm_names_from_uuids(conn, uuids)
                     if names:
@@ -936,7 +1025,7 @@ class VMManagerTUI(App):
                 except libvirt.libvirtError:
                     pass
 
-            vm_names_list = sorted(list(all_names))
+            vm_names_list = sorted(all_names)
 
             if vm_names_list:
                 self.call_from_thread(
@@ -964,8 +1053,8 @@ def main():
     args = parser.parse_args()
 
     if args.cmd:
-        from vmanager_cmd import VManagerCMD
-        VManagerCMD().cmdloop()
+        from vmanager_cmd import main as cmd_main
+        cmd_main()
     else:
         terminal_size = os.get_terminal_size()
         if terminal_size.lines < 34:
@@ -1,16 +1,79 @@
 """
 the Cmd line tool
 """
+import bisect
 import cmd
 import re
-import libvirt
+import sys
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, wraps
+from types import MappingProxyType
 from config import load_config
-from libvirt_utils import find_all_vm
-from vm_actions import start_vm, delete_vm, stop_vm, pause_vm, force_off_vm, clone_vm
-from vm_service import VMService
-from storage_manager import list_unused_volumes, list_storage_pools
 from constants import AppInfo
 
+try:
+    import readline
+except ImportError:
+    readline = None
+
+VM_NAMES_CACHE_TTL = 2.0  # seconds
+HISTORY_FILE = Path.home() / '.config' / AppInfo.name / 'cmd_history'
+HISTORY_LENGTH = 1000
+
+# Table headers, each with its separator line
+_LIST_HEADER = f"{'VM Name':<30} {'Status':<15}\n{'-'*30} {'-'*15}"
+_STATUS_HEADER = (f"{'VM Name':<30} {'Status':<15} {'vCPUs':<7} {'Memory (MiB)':<15}\n"
+                  f"{'-'*30} {'-'*15} {'-'*7} {'-'*15}")
+_STATUS_ROW_FMT = "%-30s %-15s %-7s %-15s"
+_UNUSED_VOLUMES_HEADER = (f"{'Pool':<20} {'Volume Name':<30} {'Path':<50} {'Capacity (MiB)':<15}\n"
+                          f"{'-'*20} {'-'*30} {'-'*50} {'-'*15}")
+_POOL_HEADER = (f"{'Pool Name':<30} {'Status':<15} {'Capacity (GiB)':<15} {'Allocation (GiB)':<15}\n"
+                f"{'-'*30} {'-'*15} {'-'*15} {'-'*15}")
+
+@lru_cache(maxsize=None)
+def _get_status_map():
+    """Returns the libvirt state to label mapping, built once on first use
+    so that libvirt is only imported when a command needs it."""
+    import libvirt
+
+    return MappingProxyType({
+        libvirt.VIR_DOMAIN_NOSTATE: 'No State',
+        libvirt.VIR_DOMAIN_RUNNING: 'Running',
+        libvirt.VIR_DOMAIN_BLOCKED: 'Blocked',
+        libvirt.VIR_DOMAIN_PAUSED: 'Paused',
+        libvirt.VIR_DOMAIN_SHUTDOWN: 'Shutting Down',
+        libvirt.VIR_DOMAIN_SHUTOFF: 'Stopped',
+        libvirt.VIR_DOMAIN_CRASHED: 'Crashed',
+        libvirt.VIR_DOMAIN_PMSUSPENDED: 'Suspended',
+    })
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern_str, flags=0):
+    """Compiles and caches a 're:' selection pattern."""
+    return re.compile(pattern_str, flags)
+
+_NOT_CONNECTED_MSG = "Not connected to any server. Use 'connect <server_name>'."
+
+def _needs_connection(func):
+    """Makes a command print a hint and return when no server is connected."""
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not self.active_connections:
+            print(_NOT_CONNECTED_MSG)
+            return None
+        return func(self, *args, **kwargs)
+    return wrapper
+
+def _prefix_matches(sorted_names, text):
+    """Returns the names starting with text, found by bisecting a sorted list."""
+    if not text:
+        return sorted_names[:]
+    lo = bisect.bisect_left(sorted_names, text)
+    hi = bisect.bisect_left(sorted_names, text + '\uffff', lo)
+    return sorted_names[lo:hi]
+
 class VManagerCMD(cmd.Cmd):
     """VManager command-line interface."""
     prompt = '(' + AppInfo.name + ') '
@@ -20,10 +83,46 @@ class VManagerCMD(cmd.Cmd):
         super().__init__()
         self.config = load_config()
         self.servers = self.config.get('servers', [])
-        self.server_names = [s['name'] for s in self.servers]
-        self.vm_service = VMService()
+        self.server_names = tuple(s['name'] for s in self.servers)
+        self._servers_by_name = {s['name']: s for s in self.servers}
+        self._vm_service = None
         self.active_connections = {}
         self.selected_vms = {}
+        self._vm_names_cache = {}  # {server_name: (timestamp, [vm_names])}
+        self._vm_cache_sorted = ((), [])  # (source listings, sorted unique vm_names)
+
+    @property
+    def vm_service(self):
+        """The VMService, created on first use so that libvirt is not loaded
+        before a command needs it."""
+        if self._vm_service is None:
+            from vm_service import VMService
+
+            self._vm_service = VMService()
+        return self._vm_service
+
+    def preloop(self):
+        """Sets up readline completion and loads the command history."""
+        if readline is None:
+            return
+        readline.set_completer_delims(' \t\n')
+        readline.parse_and_bind('set show-all-if-ambiguous on')
+        readline.parse_and_bind('set completion-query-items 200')
+        readline.set_history_length(HISTORY_LENGTH)
+        try:
+            readline.read_history_file(HISTORY_FILE)
+        except OSError:
+            pass
+
+    def postloop(self):
+        """Saves the command history."""
+        if readline is None:
+            return
+        try:
+            HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+            readline.write_history_file(HISTORY_FILE)
+        except OSError as e:
+            print(f"Could not save command history: {e}")
 
     def _update_prompt(self):
         if self.active_connections:
@@ -41,16 +140,71 @@ class VManagerCMD(cmd.Cmd):
         else:
             self.prompt = '(' + AppInfo.name +')> '
 
+    def _cached_vm_names(self, server_name, conn):
+        """Returns the VM names of a server, reusing a recent listing if there is one."""
+        from libvirt_utils import find_all_vm
+
+        now = time.monotonic()
+        cached = self._vm_names_cache.get(server_name)
+        if cached and now - cached[0] < VM_NAMES_CACHE_TTL:
+            return cached[1]
+        vm_names = find_all_vm(conn)
+        self._vm_names_cache[server_name] = (now, vm_names)
+        return vm_names
+
+    def _sorted_vm_names(self):
+        """Returns the sorted VM names of all connected servers, rebuilt only
+        when one of the cached per-server listings changed."""
+        import libvirt
+
+        listings = []
+        for server_name, conn in self.active_connections.items():
+            try:
+                listings.append(self._cached_vm_names(server_name, conn))
+            except libvirt.libvirtError:
+                continue
+
+        key = tuple((name, self._vm_names_cache[name][0])
+                    for name in self.active_connections if name in self._vm_names_cache)
+        if key != self._vm_cache_sorted[0]:
+            names = sorted({name for listing in listings for name in listing})
+            self._vm_cache_sorted = (key, names)
+        return self._vm_cache_sorted[1]
+
+    def _invalidate_vm_names_cache(self, server_name=None):
+        """Drops the cached VM names of one server, or of all servers."""
+        if server_name is None:
+            self._vm_names_cache.clear()
+        else:
+            self._vm_names_cache.pop(server_name, None)
+
+    @staticmethod
+    def _compile_vm_pattern(pattern_str, vm_names, warn_loose=True):
+        """Compiles a 're:' pattern, using ASCII matching when VM names allow it."""
+        if warn_loose and pattern_str.count('.*') > 1:
+            print(f"Warning: pattern '{pattern_str}' uses several '.*'; patterns match anywhere "
+                  "in the name, so a tighter pattern is usually enough.")
+        flags = re.ASCII if all(name.isascii() for name in vm_names) else 0
+        return _compile_pattern(pattern_str, flags)
+
     def _get_vms_to_operate(self, args):
+        if not args:
+            # Use the selection as-is, without splitting or copying anything
+            return self._get_vms_to_operate_list(())
+        return self._get_vms_to_operate_list(args.split())
+
+    def _get_vms_to_operate_list(self, args_list):
+        """Same as _get_vms_to_operate, for arguments that are already split."""
+        import libvirt
+
         vms_to_operate = {}
-        args_list = args.split()
 
         if args_list:
             # If args are provided, find which servers the VMs belong to
             vm_map = {}
             for server_name, conn in self.active_connections.items():
                 try:
-                    vms_on_server = find_all_vm(conn)
+                    vms_on_server = self._cached_vm_names(server_name, conn)
                     for vm_name in vms_on_server:
                         if vm_name not in vm_map:
                             vm_map[vm_name] = []
@@ -80,6 +234,8 @@ class VManagerCMD(cmd.Cmd):
     def do_connect(self, args):
         """Connect to one or more servers.
 Usage: connect <server_name_1> [<server_name_2> ...] | all"""
+        import libvirt
+
         server_names_to_connect = args.split()
 
         if not server_names_to_connect:
@@ -95,7 +251,7 @@ Usage: connect <server_name_1> [<server_name_2> ...] | all"""
                 print(f"Already connected to '{server_name}'.")
                 continue
 
-            server_info = next((s for s in self.servers if s['name'] == server_name), None)
+            server_info = self._servers_by_name.get(server_name)
 
             if not server_info:
                 print(f"Server '{server_name}' not found in configuration.")
@@ -103,7 +259,7 @@ Usage: connect <server_name_1> [<server_name_2> ...] | all"""
 
             try:
                 print(f"Connecting to {server_name} at {server_info['uri']}...")
-                conn = self.vm_service.connect(server_info['uri'])
+                conn = self.vm_service.acquire(server_info['uri'])
                 if conn:
                     self.active_connections[server_name] = conn
                     print(f"Successfully connected to '{server_name}'.")
@@ -117,14 +273,14 @@ Usage: connect <server_name_1> [<server_name_2> ...] | all"""
     def complete_connect(self, text, line, begidx, endidx):
         """Auto-completion for server names."""
         if not text:
-            completions = self.server_names[:]
-        else:
-            completions = [s for s in self.server_names if s.startswith(text)]
-        return completions
+            return self.server_names
+        return [s for s in self.server_names if s.startswith(text)]
 
     def do_disconnect(self, args):
         """Disconnects from one or more libvirt servers.
 Usage: disconnect [<server_name_1> <server_name_2> ...] | all"""
+        import libvirt
+
         if not self.active_connections:
             print("Not connected to any servers.")
             return
@@ -138,8 +294,9 @@ Usage: disconnect [<server_name_1> <server_name_2> ...] | all"""
                 try:
                     conn = self.active_connections[server_name]
                     uri = conn.getURI()
-                    self.vm_service.disconnect(uri)
+                    self.vm_service.release(uri)
                     del self.active_connections[server_name]
+                    self._invalidate_vm_names_cache(server_name)
                     if server_name in self.selected_vms:
                         del self.selected_vms[server_name]
                     print(f"Disconnected from '{server_name}'.")
@@ -150,48 +307,40 @@ Usage: disconnect [<server_name_1> <server_name_2> ...] | all"""
 
         self._update_prompt()
 
+    @_needs_connection
     def do_list_vms(self, arg):
         """List all VMs on the connected servers with their status."""
-        if not self.active_connections:
-            print("Not connected to any server. Use 'connect <server_name>'.")
-            return
+        import libvirt
 
         for server_name, conn in self.active_connections.items():
             try:
-                print(f"\n--- VMs on {server_name} ---")
-                domains = conn.listAllDomains(0)
-                if domains:
-                    print(f"{'VM Name':<30} {'Status':<15}")
-                    print(f"{'-'*30} {'-'*15}")
-
-                    status_map = {
-                        libvirt.VIR_DOMAIN_NOSTATE: 'No State',
-                        libvirt.VIR_DOMAIN_RUNNING: 'Running',
-                        libvirt.VIR_DOMAIN_BLOCKED: 'Blocked',
-                        libvirt.VIR_DOMAIN_PAUSED: 'Paused',
-                        libvirt.VIR_DOMAIN_SHUTDOWN: 'Shutting Down',
-                        libvirt.VIR_DOMAIN_SHUTOFF: 'Stopped',
-                        libvirt.VIR_DOMAIN_CRASHED: 'Crashed',
-                        libvirt.VIR_DOMAIN_PMSUSPENDED: 'Suspended',
-                    }
-
-                    sorted_domains = sorted(domains, key=lambda d: d.name())
-                    for domain in sorted_domains:
-                        status_code = domain.info()[0]
-                        status_str = status_map.get(status_code, 'Unknown')
-                        print(f"{domain.name():<30} {status_str:<15}")
+                # Show the section header before the (possibly slow) listing RPC
+                sys.stdout.write(f"\n--- VMs on {server_name} ---\n")
+                sys.stdout.flush()
+                # State of every domain in a single RPC instead of one info() per domain
+                domain_stats = conn.getAllDomainStats(libvirt.VIR_DOMAIN_STATS_STATE, 0)
+                if domain_stats:
+                    status_map = _get_status_map()
+
+                    out = [_LIST_HEADER]
+                    rows = sorted((domain.name(), params) for domain, params in domain_stats)
+                    for vm_name, params in rows:
+                        status_str = status_map.get(params.get('state.state'), 'Unknown')
+                        out.append(f"{vm_name:<30} {status_str:<15}")
+                    sys.stdout.write("\n".join(out) + "\n")
+                    sys.stdout.flush()
                 else:
                     print("No VMs found on this server.")
             except libvirt.libvirtError as e:
                 print(f"Error listing VMs on {server_name}: {e}")
 
+    @_needs_connection
     def do_select_vm(self, args):
         """Select one or more VMs from any connected server. Can use patterns with 're:' prefix.
 Usage: select_vm <vm_name_1> <vm_name_2> ...
-       select_vm re:<pattern>"""
-        if not self.active_connections:
-            print("Not connected to any server. Use 'connect <server_name>'.")
-            return
+       select_vm re:<pattern>
+Patterns match anywhere in the VM name, use '^...$' to anchor them."""
+        import libvirt
 
         arg_list = args.split()
         if not arg_list:
@@ -203,7 +352,7 @@ Usage: select_vm <vm_name_1> <vm_name_2> ...
         vm_map = {}
         for server_name, conn in self.active_connections.items():
             try:
-                vms_on_server = find_all_vm(conn)
+                vms_on_server = self._cached_vm_names(server_name, conn)
                 for vm_name in vms_on_server:
                     if vm_name not in vm_map:
                         vm_map[vm_name] = []
@@ -216,16 +365,16 @@ Usage: select_vm <vm_name_1> <vm_name_2> ...
         vms_to_select_names = set()
         invalid_inputs = []
 
+        # Validate each pattern on its own for error reporting, then fuse them
+        # so the VM list is scanned once whatever the number of patterns.
+        regex_parts = []
+        compiled_parts = []
         for arg in arg_list:
             if arg.startswith("re:"):
                 pattern_str = arg[3:]
                 try:
-                    pattern = re.compile(pattern_str)
-                    matched_vms = {vm_name for vm_name in vm_map if pattern.match(vm_name)}
-                    if matched_vms:
-                        vms_to_select_names.update(matched_vms)
-                    else:
-                        print(f"Warning: No VMs found matching pattern '{pattern_str}'.")
+                    compiled_parts.append(self._compile_vm_pattern(pattern_str, vm_map))
+                    regex_parts.append(pattern_str)
                 except re.error as e:
                     print(f"Error: Invalid regular expression '{pattern_str}': {e}")
                     invalid_inputs.append(arg)
@@ -234,10 +383,29 @@ Usage: select_vm <vm_name_1> <vm_name_2> ...
                     vms_to_select_names.add(arg)
                 else:
                     invalid_inputs.append(arg)
-        
+
+        if regex_parts:
+            # Groups would be renumbered by the fusion, breaking backreferences,
+            # and inline flags are only allowed at the start of a pattern.
+            # Such patterns are matched one by one instead.
+            matchers = [p.search for p in compiled_parts]
+            if len(compiled_parts) > 1 and not any(p.groups for p in compiled_parts):
+                try:
+                    combined = self._compile_vm_pattern(
+                        "|".join(f"(?:{p})" for p in regex_parts), vm_map, warn_loose=False
+                    )
+                    matchers = [combined.search]
+                except re.error:
+                    pass
+            matched_vms = {name for name in vm_map if any(match(name) for match in matchers)}
+            if matched_vms:
+                vms_to_select_names.update(matched_vms)
+            else:
+                print(f"Warning: No VMs found matching pattern(s) {', '.join(repr(p) for p in regex_parts)}.")
+
         # Reset selection and populate it based on the names and the vm_map
         self.selected_vms = {}
-        for vm_name in sorted(list(vms_to_select_names)):
+        for vm_name in sorted(vms_to_select_names):
             for server_name in vm_map[vm_name]:
                 if server_name not in self.selected_vms:
                     self.selected_vms[server_name] = []
@@ -260,25 +428,14 @@ Usage: select_vm <vm_name_1> <vm_name_2> ...
         if not self.active_connections:
             return []
 
-        all_vms = set()
-        for conn in self.active_connections.values():
-            try:
-                vms_on_server = find_all_vm(conn)
-                all_vms.update(vms_on_server)
-            except libvirt.libvirtError:
-                continue
-
-        if not text:
-            completions = list(all_vms)
-        else:
-            completions = [f for f in all_vms if f.startswith(text)]
-        return completions
+        return _prefix_matches(self._sorted_vm_names(), text)
 
     def do_unselect_vm(self, args):
         """Unselect one or more VMs. Can use patterns with 're:' prefix or use 'all' to unselect all.
 Usage: unselect_vm <vm_name_1> <vm_name_2> ...
        unselect_vm re:<pattern>
-       unselect_vm all"""
+       unselect_vm all
+Patterns match anywhere in the VM name, use '^...$' to anchor them."""
         if not self.selected_vms:
             print("No VMs are currently selected.")
             return
@@ -304,9 +461,9 @@ Usage: unselect_vm <vm_name_1> <vm_name_2> ...
             if arg.startswith("re:"):
                 pattern_str = arg[3:]
                 try:
-                    pattern = re.compile(pattern_str)
+                    pattern = self._compile_vm_pattern(pattern_str, currently_selected_vms)
                     # Find matches within the currently selected VMs
-                    matched_vms = {vm_name for vm_name in currently_selected_vms if pattern.match(vm_name)}
+                    matched_vms = set(filter(pattern.search, currently_selected_vms))
                     if matched_vms:
                         vms_to_unselect.update(matched_vms)
                     else:
@@ -334,7 +491,7 @@ Usage: unselect_vm <vm_name_1> <vm_name_2> ...
 
         self.selected_vms = new_selected_vms
 
-        print(f"Unselected VM(s): {', '.join(sorted(list(vms_to_unselect)))}")
+        print(f"Unselected VM(s): {', '.join(sorted(vms_to_unselect))}")
         if not_found:
             print(f"Warning: The following were not found in the selection: {', '.join(not_found)}")
 
@@ -352,229 +509,223 @@ Usage: unselect_vm <vm_name_1> <vm_name_2> ...
         if not self.selected_vms:
             return []
 
-        selected_vms_flat = {vm_name for vms_list in self.selected_vms.values() for vm_name in vms_list}
-
-        if not text:
-            completions = list(selected_vms_flat)
-        else:
-            completions = sorted([f for f in selected_vms_flat if f.startswith(text)])
-        return completions
+        selected_vms_flat = sorted({vm_name for vms_list in self.selected_vms.values() for vm_name in vms_list})
+        return _prefix_matches(selected_vms_flat, text)
 
+    @_needs_connection
     def do_status(self, args):
         """Shows the status of one or more VMs across any connected server.
 Usage: status [vm_name_1] [vm_name_2] ...
 If no VM names are provided, it will show the status of selected VMs."""
-        if not self.active_connections:
-            print("Not connected to any server. Use 'connect <server_name>'.")
-            return
+        import libvirt
 
         vms_to_check = self._get_vms_to_operate(args)
         if not vms_to_check:
             return
 
-        status_map = {
-            libvirt.VIR_DOMAIN_NOSTATE: 'No State',
-            libvirt.VIR_DOMAIN_RUNNING: 'Running',
-            libvirt.VIR_DOMAIN_BLOCKED: 'Blocked',
-            libvirt.VIR_DOMAIN_PAUSED: 'Paused',
-            libvirt.VIR_DOMAIN_SHUTDOWN: 'Shutting Down',
-            libvirt.VIR_DOMAIN_SHUTOFF: 'Stopped',
-            libvirt.VIR_DOMAIN_CRASHED: 'Crashed',
-            libvirt.VIR_DOMAIN_PMSUSPENDED: 'Suspended',
-        }
+        status_map = _get_status_map()
+
+        stats_flags = (libvirt.VIR_DOMAIN_STATS_STATE | libvirt.VIR_DOMAIN_STATS_VCPU |
+                       libvirt.VIR_DOMAIN_STATS_BALLOON)
 
         for server_name, vm_list in vms_to_check.items():
             print(f"\n--- Status on {server_name} ---")
             conn = self.active_connections[server_name]
-            print(f"{'VM Name':<30} {'Status':<15} {'vCPUs':<7} {'Memory (MiB)':<15}")
-            print(f"{'-'*30} {'-'*15} {'-'*7} {'-'*15}")
+            try:
+                # One RPC for all domains of the server instead of lookup + info() per VM
+                stats_by_name = {domain.name(): params for domain, params in conn.getAllDomainStats(stats_flags, 0)}
+            except libvirt.libvirtError as e:
+                print(f"Could not retrieve status on {server_name}: {e}")
+                continue
+
+            out = [_STATUS_HEADER]
 
             for vm_name in vm_list:
-                try:
-                    domain = conn.lookupByName(vm_name)
-                    info = domain.info()
-                    state_code = info[0]
-                    state_str = status_map.get(state_code, 'Unknown')
-                    vcpus = info[3]
-                    mem_kib = info[2]  # Current memory
-                    mem_mib = mem_kib // 1024
-                    print(f"{domain.name():<30} {state_str:<15} {vcpus:<7} {mem_mib:<15}")
-                except libvirt.libvirtError as e:
-                    print(f"Could not retrieve status for '{vm_name}': {e}")
+                params = stats_by_name.get(vm_name)
+                if params is None:
+                    out.append(f"Could not retrieve status for '{vm_name}': domain not found")
+                    continue
+                state_str = status_map.get(params.get('state.state'), 'Unknown')
+                vcpus = params.get('vcpu.current', 0)
+                mem_kib = params.get('balloon.current', 0)  # Current memory
+                mem_mib = mem_kib // 1024
+                out.append(_STATUS_ROW_FMT % (vm_name, state_str, vcpus, mem_mib))
+            sys.stdout.write("\n".join(out) + "\n")
 
     def complete_status(self, text, line, begidx, endidx):
         return self.complete_select_vm(text, line, begidx, endidx)
 
+    def _apply_action(self, vms_to_operate, title, action_one):
+        """Runs action_one(conn, vm_name) concurrently for each VM and prints the
+        returned messages as the actions complete."""
+        for server_name, vm_list in vms_to_operate.items():
+            print(f"\n--- {title} on {server_name} ---")
+            conn = self.active_connections[server_name]
+            with ThreadPoolExecutor(max_workers=min(16, len(vm_list))) as executor:
+                futures = [executor.submit(action_one, conn, vm_name) for vm_name in vm_list]
+                for future in as_completed(futures):
+                    print(future.result())
+
+    def _start_one(self, conn, vm_name):
+        import libvirt
+        from vm_actions import start_vm
+
+        try:
+            domain = conn.lookupByName(vm_name)
+            if domain.isActive():
+                return f"VM '{vm_name}' is already running."
+            start_vm(domain)
+            return f"VM '{vm_name}' started successfully."
+        except libvirt.libvirtError as e:
+            return f"Error starting VM '{vm_name}': {e}"
+        except Exception as e:
+            return f"An unexpected error occurred with VM '{vm_name}': {e}"
+
+    @_needs_connection
     def do_start(self, args):
         """Starts one or more VMs.
 Usage: start [vm_name_1] [vm_name_2] ...
 If no VM names are provided, it will start the selected VMs."""
-        if not self.active_connections:
-            print("Not connected to any server. Use 'connect <server_name>'.")
-            return
 
         vms_to_start = self._get_vms_to_operate(args)
         if not vms_to_start:
             return
 
-        for server_name, vm_list in vms_to_start.items():
-            print(f"\n--- Starting VMs on {server_name} ---")
-            conn = self.active_connections[server_name]
-            for vm_name in vm_list:
-                try:
-                    domain = conn.lookupByName(vm_name)
-                    if domain.isActive():
-                        print(f"VM '{vm_name}' is already running.")
-                        continue
-                    start_vm(domain)
-                    print(f"VM '{vm_name}' started successfully.")
-                except libvirt.libvirtError as e:
-                    print(f"Error starting VM '{vm_name}': {e}")
-                except Exception as e:
-                    print(f"An unexpected error occurred with VM '{vm_name}': {e}")
+        self._apply_action(vms_to_start, "Starting VMs", self._start_one)
 
     def complete_start(self, text, line, begidx, endidx):
         return self.complete_select_vm(text, line, begidx, endidx)
 
+    def _stop_one(self, conn, vm_name):
+        import libvirt
+        from vm_actions import stop_vm
+
+        try:
+            domain = conn.lookupByName(vm_name)
+            if not domain.isActive():
+                return f"VM '{vm_name}' is not running."
+            stop_vm(domain)
+            return f"Sent shutdown signal to VM '{vm_name}'."
+        except libvirt.libvirtError as e:
+            return f"Error stopping VM '{vm_name}': {e}"
+
+    @_needs_connection
     def do_stop(self, args):
         """Stops one or more VMs gracefully (sends shutdown signal).
 For a forced shutdown, use the 'force_off' command.
 Usage: stop [vm_name_1] [vm_name_2] ...
 If no VM names are provided, it will stop the selected VMs."""
-        if not self.active_connections:
-            print("Not connected to any server. Use 'connect <server_name>'.")
-            return
 
         vms_to_stop = self._get_vms_to_operate(args)
         if not vms_to_stop:
             return
 
-        for server_name, vm_list in vms_to_stop.items():
-            print(f"\n--- Stopping VMs on {server_name} ---")
-            conn = self.active_connections[server_name]
-            for vm_name in vm_list:
-                try:
-                    domain = conn.lookupByName(vm_name)
-                    if not domain.isActive():
-                        print(f"VM '{vm_name}' is not running.")
-                        continue
-
-                    stop_vm(domain)
-                    print(f"Sent shutdown signal to VM '{vm_name}'.")
-                except libvirt.libvirtError as e:
-                    print(f"Error stopping VM '{vm_name}': {e}")
+        self._apply_action(vms_to_stop, "Stopping VMs", self._stop_one)
 
     def complete_stop(self, text, line, begidx, endidx):
         return self.complete_select_vm(text, line, begidx, endidx)
 
+    def _force_off_one(self, conn, vm_name):
+        import libvirt
+        from vm_actions import force_off_vm
+
+        try:
+            domain = conn.lookupByName(vm_name)
+            if not domain.isActive():
+                return f"VM '{vm_name}' is not running."
+            force_off_vm(domain)
+            return f"VM '{vm_name}' forcefully powered off."
+        except libvirt.libvirtError as e:
+            return f"Error forcefully powering off VM '{vm_name}': {e}"
+        except Exception as e:
+            return f"An unexpected error occurred with VM '{vm_name}': {e}"
+
+    @_needs_connection
     def do_force_off(self, args):
         """Forcefully powers off one or more VMs (like pulling the power plug).
 Usage: force_off [vm_name_1] [vm_name_2] ...
 If no VM names are provided, it will force off the selected VMs."""
-        if not self.active_connections:
-            print("Not connected to any server. Use 'connect <server_name>'.")
-            return
 
         vms_to_force_off = self._get_vms_to_operate(args)
         if not vms_to_force_off:
             return
 
-        for server_name, vm_list in vms_to_force_off.items():
-            print(f"\n--- Force-off VMs on {server_name} ---")
-            conn = self.active_connections[server_name]
-            for vm_name in vm_list:
-                try:
-                    domain = conn.lookupByName(vm_name)
-                    if not domain.isActive():
-                        print(f"VM '{vm_name}' is not running.")
-                        continue
-                    force_off_vm(domain)
-                    print(f"VM '{vm_name}' forcefully powered off.")
-                except libvirt.libvirtError as e:
-                    print(f"Error forcefully powering off VM '{vm_name}': {e}")
-                except Exception as e:
-                    print(f"An unexpected error occurred with VM '{vm_name}': {e}")
+        self._apply_action(vms_to_force_off, "Force-off VMs", self._force_off_one)
 
     def complete_force_off(self, text, line, begidx, endidx):
         return self.complete_select_vm(text, line, begidx, endidx)
 
+    def _pause_one(self, conn, vm_name):
+        import libvirt
+        from vm_actions import pause_vm
+
+        try:
+            domain = conn.lookupByName(vm_name)
+            if not domain.isActive():
+                return f"VM '{vm_name}' is not running."
+            if domain.info()[0] == libvirt.VIR_DOMAIN_PAUSED:
+                return f"VM '{vm_name}' is already paused."
+            pause_vm(domain)
+            return f"VM '{vm_name}' paused."
+        except libvirt.libvirtError as e:
+            return f"Error pausing VM '{vm_name}': {e}"
+
+    @_needs_connection
     def do_pause(self, args):
         """Pauses one or more running VMs.
 Usage: pause [vm_name_1] [vm_name_2] ...
 If no VM names are provided, it will pause the selected VMs."""
-        if not self.active_connections:
-            print("Not connected to any server. Use 'connect <server_name>'.")
-            return
 
         vms_to_pause = self._get_vms_to_operate(args)
         if not vms_to_pause:
             return
 
-        for server_name, vm_list in vms_to_pause.items():
-            print(f"\n--- Pausing VMs on {server_name} ---")
-            conn = self.active_connections[server_name]
-            for vm_name in vm_list:
-                try:
-                    domain = conn.lookupByName(vm_name)
-                    if not domain.isActive():
-                        print(f"VM '{vm_name}' is not running.")
-                        continue
-                    if domain.info()[0] == libvirt.VIR_DOMAIN_PAUSED:
-                        print(f"VM '{vm_name}' is already paused.")
-                        continue
-                    pause_vm(domain)
-                    print(f"VM '{vm_name}' paused.")
-                except libvirt.libvirtError as e:
-                    print(f"Error pausing VM '{vm_name}': {e}")
+        self._apply_action(vms_to_pause, "Pausing VMs", self._pause_one)
 
     def complete_pause(self, text, line, begidx, endidx):
         return self.complete_select_vm(text, line, begidx, endidx)
 
+    def _resume_one(self, conn, vm_name):
+        import libvirt
 
+        try:
+            domain = conn.lookupByName(vm_name)
+            if domain.info()[0] != libvirt.VIR_DOMAIN_PAUSED:
+                return f"VM '{vm_name}' is not paused."
+            domain.resume()
+            return f"VM '{vm_name}' resumed."
+        except libvirt.libvirtError as e:
+            return f"Error resuming VM '{vm_name}': {e}"
+
+    @_needs_connection
     def do_resume(self, args):
         """Resumes one or more paused VMs.
 Usage: resume [vm_name_1] [vm_name_2] ...
 If no VM names are provided, it will resume the selected VMs."""
-        if not self.active_connections:
-            print("Not connected to any server. Use 'connect <server_name>'.")
-            return
 
         vms_to_resume = self._get_vms_to_operate(args)
         if not vms_to_resume:
             return
 
-        for server_name, vm_list in vms_to_resume.items():
-            print(f"\n--- Resuming VMs on {server_name} ---")
-            conn = self.active_connections[server_name]
-            for vm_name in vm_list:
-                try:
-                    domain = conn.lookupByName(vm_name)
-                    if domain.info()[0] != libvirt.VIR_DOMAIN_PAUSED:
-                        print(f"VM '{vm_name}' is not paused.")
-                        continue
-                    domain.resume()
-                    print(f"VM '{vm_name}' resumed.")
-                except libvirt.libvirtError as e:
-                    print(f"Error resuming VM '{vm_name}': {e}")
+        self._apply_action(vms_to_resume, "Resuming VMs", self._resume_one)
 
     def complete_resume(self, text, line, begidx, endidx):
         return self.complete_select_vm(text, line, begidx, endidx)
 
+    @_needs_connection
     def do_delete(self, args):
         """Deletes one or more VMs, optionally removing associated storage.
 Usage: delete [--force-storage-delete] [vm_name_1] [vm_name_2] ...
 Use --force-storage-delete to automatically confirm deletion of associated storage.
 If no VM names are provided, it will delete the selected VMs."""
-        if not self.active_connections:
-            print("Not connected to any server. Use 'connect <server_name>'.")
-            return
+        import libvirt
+        from vm_actions import delete_vm
 
         args_list = args.split()
         force_storage_delete = "--force-storage-delete" in args_list
-        if force_storage_delete:
-            args_list.remove("--force-storage-delete")
-        
-        vms_to_delete = self._get_vms_to_operate(" ".join(args_list))
+        vm_args = [arg for arg in args_list if arg != "--force-storage-delete"]
+
+        vms_to_delete = self._get_vms_to_operate_list(vm_args)
         if not vms_to_delete:
             return
 
@@ -598,13 +749,25 @@ If no VM names are provided, it will delete the selected VMs."""
             if confirm_storage == 'yes':
                 delete_storage_confirmed = True
 
+        def fetch_xml(conn, vm_name):
+            try:
+                return conn.lookupByName(vm_name).XMLDesc(0)
+            except libvirt.libvirtError:
+                return None
+
         for server_name, vm_list in vms_to_delete.items():
             print(f"\n--- Deleting VMs on {server_name} ---")
             conn = self.active_connections[server_name]
+            xml_map = {}
+            if delete_storage_confirmed:
+                # Fetch the domain XMLs of the whole batch concurrently, before deleting anything
+                with ThreadPoolExecutor(max_workers=min(16, len(vm_list))) as executor:
+                    xml_map = dict(zip(vm_list, executor.map(lambda name: fetch_xml(conn, name), vm_list)))
             for vm_name in vm_list:
                 try:
                     domain = conn.lookupByName(vm_name)
-                    delete_vm(domain, delete_storage_confirmed)
+                    delete_vm(domain, delete_storage_confirmed, xml_desc=xml_map.get(vm_name))
+                    self._invalidate_vm_names_cache(server_name)
                     print(f"VM '{vm_name}' deleted successfully.")
                     if delete_storage_confirmed:
                         print(f"Associated storage for '{vm_name}' also deleted.")
@@ -620,6 +783,9 @@ If no VM names are provided, it will delete the selected VMs."""
     def do_clone_vm(self, args):
         """Clones a VM.
 Usage: clone_vm <original_vm_name> <new_vm_name>"""
+        import libvirt
+        from vm_actions import clone_vm
+
         arg_list = args.split()
         if len(arg_list) != 2:
             print("Usage: clone_vm <original_vm_name> <new_vm_name>")
@@ -667,6 +833,7 @@ Usage: clone_vm <original_vm_name> <new_vm_name>"""
                 print(f"  -> {message.strip()}")
 
             clone_vm(original_vm_domain, new_vm_name, log_callback=log_to_console)
+            self._invalidate_vm_names_cache(original_vm_server_name)
             print(f"\nSuccessfully cloned '{original_vm_name}' to '{new_vm_name}'.")
 
         except libvirt.libvirtError as e:
@@ -683,13 +850,13 @@ Usage: clone_vm <original_vm_name> <new_vm_name>"""
 
         return self.complete_select_vm(text, line, begidx, endidx)
 
+    @_needs_connection
     def do_list_unused_volumes(self, args):
         """Lists all storage volumes that are not attached to any VM.
 If pool_name is provided, only checks volumes in that specific pool.
 Usage: list_unused_volumes [pool_name]"""
-        if not self.active_connections:
-            print("Not connected to any server. Use 'connect <server_name>'.")
-            return
+        import libvirt
+        from storage_manager import list_unused_volumes
 
         pool_name = args.strip() if args else None
 
@@ -698,13 +865,20 @@ Usage: list_unused_volumes [pool_name]"""
             try:
                 unused_volumes = list_unused_volumes(conn, pool_name)
                 if unused_volumes:
-                    print(f"{'Pool':<20} {'Volume Name':<30} {'Path':<50} {'Capacity (MiB)':<15}")
-                    print(f"{'-'*20} {'-'*30} {'-'*50} {'-'*15}")
+                    if pool_name:
+                        vol_to_pool = {vol.key(): pool_name for vol in unused_volumes}
+                    else:
+                        # One listing per pool instead of a pool lookup RPC per volume
+                        vol_to_pool = {vol.key(): pool.name()
+                                       for pool in conn.listAllStoragePools(0) if pool.isActive()
+                                       for vol in pool.listAllVolumes(0)}
+                    out = [_UNUSED_VOLUMES_HEADER]
                     for vol in unused_volumes:
-                        pool_name_vol = vol.storagePoolLookupByVolume().name()
+                        pool_name_vol = vol_to_pool.get(vol.key(), '?')
                         info = vol.info()
                         capacity_mib = info[1] // (1024 * 1024)
-                        print(f"{pool_name_vol:<20} {vol.name():<30} {vol.path():<50} {capacity_mib:<15}")
+                        out.append(f"{pool_name_vol:<20} {vol.name():<30} {vol.path():<50} {capacity_mib:<15}")
+                    sys.stdout.write("\n".join(out) + "\n")
                 else:
                     print("No unused volumes found on this server.")
             except libvirt.libvirtError as e:
@@ -712,20 +886,19 @@ Usage: list_unused_volumes [pool_name]"""
             except Exception as e:
                 print(f"An unexpected error occurred on {server_name}: {e}")
 
+    @_needs_connection
     def do_list_pool(self, args):
         """Lists all storage pools on the connected servers.
 Usage: list_pool"""
-        if not self.active_connections:
-            print("Not connected to any server. Use 'connect <server_name>'.")
-            return
+        import libvirt
+        from storage_manager import list_storage_pools
 
         for server_name, conn in self.active_connections.items():
             print(f"\n--- Storage Pools on {server_name} ---")
             try:
                 pools_info = list_storage_pools(conn)
                 if pools_info:
-                    print(f"{'Pool Name':<30} {'Status':<15} {'Capacity (GiB)':<15} {'Allocation (GiB)':<15}")
-                    print(f"{'-'*30} {'-'*15} {'-'*15} {'-'*15}")
+                    print(_POOL_HEADER)
                     for pool_info in pools_info:
                         capacity_gib = pool_info['capacity'] // (1024*1024*1024)
                         allocation_gib = pool_info['allocation'] // (1024*1024*1024)
@@ -739,6 +912,9 @@ Usage: list_pool"""
 
     def complete_list_unused_volumes(self, text, _, _b, _e):
         """Auto-completion for pool names in list_unused_volumes command."""
+        import libvirt
+        from storage_manager import list_storage_pools
+
         if not self.active_connections:
             return []
 
@@ -756,10 +932,35 @@ Usage: list_pool"""
         else:
             return [pool for pool in all_pool_names if pool.startswith(text)]
 
+    def do_source(self, args):
+        """Runs the commands listed in a script file, one command per line.
+Empty lines and lines starting with '#' are ignored.
+Usage: source <path>"""
+        path = args.strip()
+        if not path:
+            print("Usage: source <path>")
+            return
+
+        try:
+            with open(path, 'r') as f:
+                lines = f.read().splitlines()
+        except OSError as e:
+            print(f"Error reading script '{path}': {e}")
+            return
+
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if self.onecmd(line):
+                return True
+        self._update_prompt()
+
     def do_quit(self, arg):
         """Exit the virtui-manager shell."""
         # Disconnect all connections when quitting
-        self.vm_service.disconnect_all()
+        if self._vm_service is not None:
+            self.vm_service.disconnect_all()
         print(f"\nExiting {AppInfo.namecase}.")
         return True
 
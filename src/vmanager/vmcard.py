@@ -4,7 +4,7 @@ VMcard Interface
 import subprocess
 import logging
 import traceback
-from functools import partial
+import xml.etree.ElementTree as ET
 import libvirt
 
 from textual.widgets import (
@@ -17,19 +17,23 @@ from textual import on
 from textual.events import Click
 from textual.css.query import NoMatches
 
-from events import VMNameClicked, VMSelectionChanged, VmActionRequest
+from events import VMNameClicked, VMSelectionChanged, VmActionRequest, VmStatsUpdate
 from vm_actions import (
         clone_vm, rename_vm, create_vm_snapshot,
         restore_vm_snapshot, delete_vm_snapshot
         )
-from vm_queries import get_vm_snapshots, get_vm_cpu_details, _get_domain_root
+from vm_queries import (
+        get_vm_snapshots, get_vm_cpu_details, get_vm_graphics_info,
+        get_status, _parse_domain_xml
+        )
 
 from modals.xml_modals import XMLDisplayModal
 from modals.utils_modals import ConfirmationDialog, ProgressModal
 from modals.migration_modals import MigrationModal
 from vmcard_dialog import (
         DeleteVMConfirmationDialog, WebConsoleConfigDialog,
-        AdvancedCloneDialog, RenameVMDialog, SelectSnapshotDialog, SnapshotNameDialog
+        AdvancedCloneDialog, RenameVMDialog, SelectSnapshotDialog, SnapshotNameDialog,
+        DeleteSnapshotDialog
         )
 from utils import extract_server_name_from_uri
 from constants import (
@@ -37,6 +41,8 @@ from constants import (
     SparklineLabels, ErrorMessages, DialogMessages,
 )
 
+STATUS_PREFIX = "Status: "
+
 class VMCard(Static):
     """
     Main VM card
@@ -63,12 +69,43 @@ class VMCard(Static):
     latest_net_rx = reactive(0.0)
     latest_net_tx = reactive(0.0)
 
+    # Button id -> name of the handler method
+    _BUTTON_HANDLERS = {
+        ButtonIds.SHUTDOWN: "_handle_shutdown_button",
+        ButtonIds.STOP: "_handle_stop_button",
+        ButtonIds.PAUSE: "_handle_pause_button",
+        ButtonIds.RESUME: "_handle_resume_button",
+        ButtonIds.XML: "_handle_xml_button",
+        ButtonIds.CONNECT: "_handle_connect_button",
+        ButtonIds.WEB_CONSOLE: "_handle_web_console_button",
+        ButtonIds.SNAPSHOT_TAKE: "_handle_snapshot_take_button",
+        ButtonIds.SNAPSHOT_RESTORE: "_handle_snapshot_restore_button",
+        ButtonIds.SNAPSHOT_DELETE: "_handle_snapshot_delete_button",
+        ButtonIds.DELETE: "_handle_delete_button",
+        ButtonIds.CLONE: "_handle_clone_button",
+        ButtonIds.MIGRATION: "_handle_migration_button",
+        ButtonIds.RENAME_BUTTON: "_handle_rename_button",
+        ButtonIds.CONFIGURE_BUTTON: "_handle_configure_button",
+    }
+
     def __init__(self, is_selected: bool = False) -> None:
         self.ui = {}
         super().__init__()
         self.is_selected = is_selected
-        self.timer = None
         self._boot_device_checked = False
+        self._rendered_text: dict[str, str] = {}  # Last text written to each Static in self.ui
+        self._cached_uuid = (None, None)  # (domain, uuid)
+        self._cached_snapshot_count = (None, None)  # (domain, count)
+        self._cached_snapshots = (None, None)  # (domain, snapshots info)
+        self._last_display: dict[str, bool] = {}  # Last display value set on each widget in self.ui
+        self._xml_cache = (None, None)  # (domain, xml)
+        self._xml_tree_cache = (None, None)  # (domain, parsed xml)
+        self._resource_labels = (None, None)  # ((cpu, memory), (vcpu_label, memory_label))
+        self._snapshot_populated = False  # Snapshot tab buttons mounted
+        self._last_status_class = ""  # Status class currently set on the status widget
+        self._layout_timer = None  # Pending debounced update_button_layout
+        self._layout_key = None  # Inputs of the last button layout applied
+        self._special_populated = False  # Special tab buttons mounted
 
     def _get_vm_display_name(self) -> str:
         """Returns the formatted VM name including server name if available."""
@@ -77,10 +114,64 @@ class VMCard(Static):
             return f"{self.name} ({server_display})"
         return self.name
 
+    @property
+    def vm_uuid(self) -> str:
+        """UUID of the card's VM, fetched once per domain object."""
+        vm = self.vm
+        if self._cached_uuid[0] is not vm:
+            self._cached_uuid = (vm, vm.UUIDString())
+        return self._cached_uuid[1]
+
+    def _get_snapshot_count(self) -> int:
+        """Number of snapshots of the VM, fetched once per domain object and
+        refreshed after snapshot changes made from the card."""
+        vm = self.vm
+        if self._cached_snapshot_count[0] is not vm:
+            if self._cached_snapshots[0] is vm:
+                count = len(self._cached_snapshots[1])
+            else:
+                count = vm.snapshotNum(0)
+            self._cached_snapshot_count = (vm, count)
+        return self._cached_snapshot_count[1]
+
+    def _get_snapshots(self) -> list[dict]:
+        """Snapshots of the VM with details, cached like the snapshot count."""
+        vm = self.vm
+        if self._cached_snapshots[0] is not vm:
+            self._cached_snapshots = (vm, get_vm_snapshots(vm))
+        return self._cached_snapshots[1]
+
+    def _invalidate_snapshots(self) -> None:
+        self._cached_snapshot_count = (None, None)
+        self._cached_snapshots = (None, None)
+
+    def _get_xml(self) -> str:
+        """XML description of the VM, fetched once per domain object and dropped
+        on status changes, since a started VM gets its live graphics port."""
+        vm = self.vm
+        if self._xml_cache[0] is not vm:
+            self._xml_cache = (vm, vm.XMLDesc(0))
+        return self._xml_cache[1]
+
+    def _invalidate_xml(self) -> None:
+        self._xml_cache = (None, None)
+        self._xml_tree_cache = (None, None)
+
+    def _get_xml_tree(self) -> ET.Element | None:
+        """Parsed tree of the cached XML, shared by the card's XML consumers."""
+        vm = self.vm
+        if self._xml_tree_cache[0] is not vm:
+            self._xml_tree_cache = (vm, _parse_domain_xml(self._get_xml()))
+        return self._xml_tree_cache[1]
+
+    def _get_graphics_info(self) -> dict:
+        """Graphics details parsed from the cached XML."""
+        return get_vm_graphics_info(self._get_xml_tree())
+
     def _get_snapshot_tab_title(self) -> str:
         if self.vm:
             try:
-                num_snapshots = len(self.vm.listAllSnapshots(0))
+                num_snapshots = self._get_snapshot_count()
                 if num_snapshots == 0:
                     return TabTitles.SNAPSHOT
                 elif num_snapshots > 0 and num_snapshots < 2:
@@ -102,11 +193,11 @@ class VMCard(Static):
         except NoMatches:
             logging.warning("Could not find snapshot tab to update title.")
 
-    def _update_webc_status(self) -> None:
+    def update_webc_status(self) -> None:
         """Updates the web console status indicator."""
         if hasattr(self.app, 'webconsole_manager') and self.vm:
             try:
-                uuid = self.vm.UUIDString()
+                uuid = self.vm_uuid
                 if self.app.webconsole_manager.is_running(uuid):
                     if self.webc_status_indicator != " (WebC On)":
                         self.webc_status_indicator = " (WebC On)"
@@ -120,19 +211,47 @@ class VMCard(Static):
         if self.webc_status_indicator != "":
             self.webc_status_indicator = ""
 
+    def _get_resource_labels(self) -> tuple[str, str]:
+        """vCPU and memory sparkline labels, formatted again only when the VM's
+        vCPU count or memory changes."""
+        key = (self.cpu, self.memory)
+        if self._resource_labels[0] != key:
+            mem_gb = round(self.memory / 1024, 1)
+            self._resource_labels = (key, (
+                SparklineLabels.VCPU.format(cpu=self.cpu),
+                SparklineLabels.MEMORY_GB.format(mem=mem_gb),
+            ))
+        return self._resource_labels[1]
+
+    def _update_text(self, key: str, text: str) -> None:
+        """Updates a Static from self.ui, skipping the re-render if the text is unchanged."""
+        widget = self.ui.get(key)
+        if widget and self._rendered_text.get(key) != text:
+            widget.update(text)
+            self._rendered_text[key] = text
+
     def watch_webc_status_indicator(self, old_value: str, new_value: str) -> None:
         """Called when webc_status_indicator changes."""
         if not self.ui:
             return
-        status_widget = self.ui.get("status")
-        if status_widget:
-            status_text = f"Status: {self.status}{new_value}"
-            status_widget.update(status_text)
+        self._update_text("status", STATUS_PREFIX + self.status + new_value)
 
     def compose(self):
+        # Fresh widgets, forget what was written to the previous ones
+        self._rendered_text = {}
+        self._last_display = {}
+        self._layout_key = None
+        # Snapshot and Special tab buttons are only built when their tab is first shown
+        self._snapshot_populated = False
+        self._special_populated = False
+        for key in (ButtonIds.SNAPSHOT_TAKE, ButtonIds.SNAPSHOT_RESTORE, ButtonIds.SNAPSHOT_DELETE,
+                    ButtonIds.DELETE, ButtonIds.CLONE, ButtonIds.MIGRATION, ButtonIds.XML,
+                    ButtonIds.RENAME_BUTTON):
+            self.ui.pop(key, None)
         self.ui["checkbox"] = Checkbox("", id="vm-select-checkbox", classes="vm-select-checkbox", value=self.is_selected)
         self.ui["vmname"] = Static(self._get_vm_display_name(), id="vmname", classes="vmname")
-        self.ui["status"] = Static(f"Status: {self.status}{self.webc_status_indicator}", id="status", classes=self.status.lower())
+        self._last_status_class = self.status.lower()
+        self.ui["status"] = Static(STATUS_PREFIX + self.status + self.webc_status_indicator, id="status", classes=self._last_status_class)
         
         self.ui["top_label"] = Static("", id="top-sparkline-label", classes="sparkline-label")
         self.ui["top_sparkline"] = Sparkline([], id="top-sparkline")
@@ -150,16 +269,6 @@ class VMCard(Static):
         self.ui[ButtonIds.CONFIGURE_BUTTON] = Button(ButtonLabels.CONFIGURE, id=ButtonIds.CONFIGURE_BUTTON, variant="primary")
         self.ui[ButtonIds.WEB_CONSOLE] = Button(ButtonLabels.WEB_CONSOLE, id=ButtonIds.WEB_CONSOLE, variant="default")
         self.ui[ButtonIds.CONNECT] = Button(ButtonLabels.CONNECT, id=ButtonIds.CONNECT, variant="default")
-        
-        self.ui[ButtonIds.SNAPSHOT_TAKE] = Button(ButtonLabels.SNAPSHOT, id=ButtonIds.SNAPSHOT_TAKE, variant="primary")
-        self.ui[ButtonIds.SNAPSHOT_RESTORE] = Button(ButtonLabels.RESTORE_SNAPSHOT, id=ButtonIds.SNAPSHOT_RESTORE, variant="primary")
-        self.ui[ButtonIds.SNAPSHOT_DELETE] = Button(ButtonLabels.DELETE_SNAPSHOT, id=ButtonIds.SNAPSHOT_DELETE, variant="error")
-
-        self.ui[ButtonIds.DELETE] = Button(ButtonLabels.DELETE, id=ButtonIds.DELETE, variant="success", classes="delete-button")
-        self.ui[ButtonIds.CLONE] = Button(ButtonLabels.CLONE, id=ButtonIds.CLONE, classes="clone-button")
-        self.ui[ButtonIds.MIGRATION] = Button(ButtonLabels.MIGRATION, id=ButtonIds.MIGRATION, variant="primary", classes="migration-button")
-        self.ui[ButtonIds.XML] = Button(ButtonLabels.VIEW_XML, id=ButtonIds.XML)
-        self.ui[ButtonIds.RENAME_BUTTON] = Button(ButtonLabels.RENAME, id=ButtonIds.RENAME_BUTTON, variant="primary", classes="rename-button")
 
         self.ui["tabbed_content"] = TabbedContent(id="button-container")
 
@@ -186,25 +295,55 @@ class VMCard(Static):
                             yield self.ui[ButtonIds.CONFIGURE_BUTTON]
                             yield self.ui[ButtonIds.WEB_CONSOLE]
                             yield self.ui[ButtonIds.CONNECT]
-                with TabPane(self._get_snapshot_tab_title(), id="snapshot-tab"):
-                    with Horizontal():
-                        with Vertical():
-                            yield self.ui[ButtonIds.SNAPSHOT_TAKE]
-                        with Vertical():
-                            yield self.ui[ButtonIds.SNAPSHOT_RESTORE]
-                            yield Static(classes="button-separator")
-                            yield self.ui[ButtonIds.SNAPSHOT_DELETE]
-                with TabPane(TabTitles.SPECIAL, id="special-tab"):
-                    with Horizontal():
-                        with Vertical():
-                            yield self.ui[ButtonIds.DELETE]
-                            yield Static(classes="button-separator")
-                            yield self.ui[ButtonIds.CLONE]
-                            yield self.ui[ButtonIds.MIGRATION]
-                        with Vertical():
-                            yield self.ui[ButtonIds.XML]
-                            yield Static(classes="button-separator")
-                            yield self.ui[ButtonIds.RENAME_BUTTON]
+                yield TabPane(self._get_snapshot_tab_title(), id="snapshot-tab")
+                yield TabPane(TabTitles.SPECIAL, id="special-tab")
+
+    def _build_snapshot_buttons(self) -> Horizontal:
+        self.ui[ButtonIds.SNAPSHOT_TAKE] = Button(ButtonLabels.SNAPSHOT, id=ButtonIds.SNAPSHOT_TAKE, variant="primary")
+        self.ui[ButtonIds.SNAPSHOT_RESTORE] = Button(ButtonLabels.RESTORE_SNAPSHOT, id=ButtonIds.SNAPSHOT_RESTORE, variant="primary")
+        self.ui[ButtonIds.SNAPSHOT_DELETE] = Button(ButtonLabels.DELETE_SNAPSHOT, id=ButtonIds.SNAPSHOT_DELETE, variant="error")
+        return Horizontal(
+            Vertical(self.ui[ButtonIds.SNAPSHOT_TAKE]),
+            Vertical(
+                self.ui[ButtonIds.SNAPSHOT_RESTORE],
+                Static(classes="button-separator"),
+                self.ui[ButtonIds.SNAPSHOT_DELETE],
+            ),
+        )
+
+    def _build_special_buttons(self) -> Horizontal:
+        self.ui[ButtonIds.DELETE] = Button(ButtonLabels.DELETE, id=ButtonIds.DELETE, variant="success", classes="delete-button")
+        self.ui[ButtonIds.CLONE] = Button(ButtonLabels.CLONE, id=ButtonIds.CLONE, classes="clone-button")
+        self.ui[ButtonIds.MIGRATION] = Button(ButtonLabels.MIGRATION, id=ButtonIds.MIGRATION, variant="primary", classes="migration-button")
+        self.ui[ButtonIds.XML] = Button(ButtonLabels.VIEW_XML, id=ButtonIds.XML)
+        self.ui[ButtonIds.RENAME_BUTTON] = Button(ButtonLabels.RENAME, id=ButtonIds.RENAME_BUTTON, variant="primary", classes="rename-button")
+        return Horizontal(
+            Vertical(
+                self.ui[ButtonIds.DELETE],
+                Static(classes="button-separator"),
+                self.ui[ButtonIds.CLONE],
+                self.ui[ButtonIds.MIGRATION],
+            ),
+            Vertical(
+                self.ui[ButtonIds.XML],
+                Static(classes="button-separator"),
+                self.ui[ButtonIds.RENAME_BUTTON],
+            ),
+        )
+
+    @on(TabbedContent.TabActivated, "#button-container")
+    def populate_button_tab(self, event: TabbedContent.TabActivated) -> None:
+        """Mounts the Snapshot and Special tab buttons the first time their tab is shown."""
+        pane = event.pane
+        if pane.id == "snapshot-tab" and not self._snapshot_populated:
+            self._snapshot_populated = True
+            pane.mount(self._build_snapshot_buttons())
+        elif pane.id == "special-tab" and not self._special_populated:
+            self._special_populated = True
+            pane.mount(self._build_special_buttons())
+        else:
+            return
+        self.update_button_layout()
 
     def _update_tooltip(self) -> None:
         """Updates the tooltip for the VM name using Markdown."""
@@ -212,7 +351,7 @@ class VMCard(Static):
             return
 
         try:
-            uuid = self.vm.UUIDString() if self.vm else "Unknown"
+            uuid = self.vm_uuid if self.vm else "Unknown"
         except libvirt.libvirtError:
             uuid = "Unknown"
 
@@ -256,30 +395,19 @@ class VMCard(Static):
 
         self.update_button_layout()
         self._update_status_styling()
-        self._update_webc_status()
+        self.update_webc_status()
         self.update_sparkline_display()
         self._update_tooltip()
 
-        if self.vm:
-            try:
-                uuid = self.vm.UUIDString()
-                if uuid in self.app.sparkline_data:
-                    self.update_sparkline_display()
-            except (libvirt.libvirtError, NoMatches):
-                pass
-
-        self.update_stats()
-        # Timer is now managed within update_stats for dynamic intervals
-        # self.timer = self.set_interval(stats_interval, self.update_stats)
-
     def watch_stats_view_mode(self, old_mode: str, new_mode: str) -> None:
         """Update sparklines when view mode changes."""
         if not self.ui:
             return
         self.update_sparkline_display()
 
-    def update_sparkline_display(self) -> None:
-        """Updates the labels and data of the sparklines based on the current view mode."""
+    def update_sparkline_display(self, storage: dict | None = None) -> None:
+        """Updates the labels and data of the sparklines based on the current view mode.
+        storage is the VM's sparkline_data entry, looked up when not given."""
         top_label = self.ui.get("top_label")
         bottom_label = self.ui.get("bottom_label")
         top_sparkline = self.ui.get("top_sparkline")
@@ -288,17 +416,14 @@ class VMCard(Static):
         if not all([top_label, bottom_label, top_sparkline, bottom_sparkline]):
             return
 
-        uuid = self.vm.UUIDString() if self.vm else None
-
         # Determine data source
-        storage = {}
-        if uuid and hasattr(self.app, 'sparkline_data') and uuid in self.app.sparkline_data:
-            storage = self.app.sparkline_data[uuid]
+        if storage is None:
+            storage = {}
+            if self.vm and hasattr(self.app, 'sparkline_data'):
+                storage = self.app.sparkline_data.get(self.vm_uuid, {})
 
         if self.stats_view_mode == "resources":
-            mem_gb = round(self.memory / 1024, 1)
-            top_text = SparklineLabels.VCPU.format(cpu=self.cpu)
-            bottom_text = SparklineLabels.MEMORY_GB.format(mem=mem_gb)
+            top_text, bottom_text = self._get_resource_labels()
             top_data = list(storage.get("cpu", []))
             bottom_data = list(storage.get("mem", []))
         else: # io mode
@@ -313,8 +438,8 @@ class VMCard(Static):
             bottom_data = list(storage.get("net", []))
 
         # Update UI
-        top_label.update(top_text)
-        bottom_label.update(bottom_text)
+        self._update_text("top_label", top_text)
+        self._update_text("bottom_label", bottom_text)
 
         # Only update data if we have storage (avoids clearing if not needed, though empty list is fine)
         # Actually existing logic updated data even if empty, which clears the sparkline.
@@ -350,31 +475,26 @@ class VMCard(Static):
 
     def watch_status(self, old_value: str, new_value: str) -> None:
         """Called when status changes."""
+        self._invalidate_xml()
         if not self.ui:
             return
-        self._update_status_styling()
-        self.update_button_layout()
-        self._update_tooltip()
-
-        status_widget = self.ui.get("status")
-        if status_widget:
-            status_widget.update(f"Status: {new_value}{self.webc_status_indicator}")
+        # One repaint for the styling, buttons, tooltip and text changes
+        with self.app.batch_update():
+            self._update_status_styling()
+            self._schedule_button_layout()
+            self._update_tooltip()
+            self._update_text("status", STATUS_PREFIX + new_value + self.webc_status_indicator)
+
+    def apply_state(self, new_status: str) -> None:
+        """Applies a status change made from this card; watch_status does the
+        text, styling, button layout and tooltip updates once."""
+        if self.status != new_status:
+            self.status = new_status
 
     def watch_server_border_color(self, old_color: str, new_color: str) -> None:
         """Called when server_border_color changes."""
         self.styles.border = ("solid", new_color)
 
-    def on_unmount(self) -> None:
-        """Stop the timer and cancel any running stat workers when the widget is removed."""
-        if self.timer:
-            self.timer.stop()
-        if self.vm:
-            try:
-                uuid = self.vm.UUIDString()
-                self.app.worker_manager.cancel(f"update_stats_{uuid}")
-            except libvirt.libvirtError:
-                pass
-
     def watch_is_selected(self, old_value: bool, new_value: bool) -> None:
         """Called when is_selected changes to update the checkbox."""
         if not self.ui:
@@ -388,93 +508,69 @@ class VMCard(Static):
         else:
             self.styles.border = ("solid", self.server_border_color)
 
-    def update_stats(self) -> None:
-        """Schedules a worker to update statistics for the VM."""
-        if not self.vm:
+    def collect_extra_stats(self, stats: dict | None) -> tuple[list, str]:
+        """Fetches the IP addresses and boot device to go with a stats sample.
+        Runs in the app's stats polling worker."""
+        from vm_queries import get_vm_network_ip, get_boot_info
+
+        # Fetch boot info if not yet set. Only check once per lifecycle to save CPU.
+        boot_dev = self.boot_device
+        if not boot_dev and not getattr(self, "_boot_device_checked", False):
+            boot_info = get_boot_info(self.conn, self._get_xml_tree())
+            if boot_info['order']:
+                boot_dev = boot_info['order'][0]
+            self._boot_device_checked = True
+
+        # Fetch IPs if running (check stats status, not UI status which might be stale)
+        ips = []
+        if stats and stats.get("status") == StatusText.RUNNING:
+            ips = get_vm_network_ip(self.vm)
+        return ips, boot_dev
+
+    def on_vm_stats_update(self, message: VmStatsUpdate) -> None:
+        """Applies a stats sample polled by the app."""
+        if not self.is_mounted:
             return
-
-        # Schedule next update
-        interval = self.app.config.get('STATS_INTERVAL', 5)
-        self.timer = self.set_timer(interval, self.update_stats)
-
-        try:
-            uuid = self.vm.UUIDString()
-        except libvirt.libvirtError:
-            if self.timer:
-                self.timer.stop()
+        stats = message.stats
+        if not stats:
+            # Stopped: nothing to sample, only push what actually changed
+            if self.status != StatusText.STOPPED:
+                self.status = StatusText.STOPPED
+            if self.ip_addresses:
+                self.ip_addresses = []
+            if self.boot_device != message.boot_device:
+                self.boot_device = message.boot_device
             return
 
-        def update_worker():
-            from vm_queries import get_vm_network_ip, get_boot_info, _get_domain_root
-            try:
-                stats = self.app.vm_service.get_vm_runtime_stats(self.vm)
-
-                # Fetch boot info if not yet set. Only check once per lifecycle to save CPU.
-                boot_dev = self.boot_device
-                if not boot_dev and not getattr(self, "_boot_device_checked", False):
-                    _, root = _get_domain_root(self.vm)
-                    boot_info = get_boot_info(self.conn, root)
-                    if boot_info['order']:
-                        boot_dev = boot_info['order'][0]
-                    self._boot_device_checked = True
-
-                if not stats:
-                    if self.status != StatusText.STOPPED:
-                        self.app.call_from_thread(setattr, self, 'status', StatusText.STOPPED)
-                    self.app.call_from_thread(setattr, self, 'ip_addresses', [])
-                    self.app.call_from_thread(setattr, self, 'boot_device', boot_dev)
-                    return
-
-                # Fetch IPs if running (check stats status, not UI status which might be stale)
-                ips = []
-                if stats.get("status") == StatusText.RUNNING:
-                    ips = get_vm_network_ip(self.vm)
+        if self.status != stats["status"]:
+            self.status = stats["status"]
 
-                def apply_stats_to_ui():
-                    if not self.is_mounted:
-                        return
-                    if self.status != stats["status"]:
-                        self.status = stats["status"]
+        self.ip_addresses = message.ip_addresses
+        self.boot_device = message.boot_device
 
-                    self.ip_addresses = ips
-                    self.boot_device = boot_dev
+        self.latest_disk_read = stats.get('disk_read_kbps', 0)
+        self.latest_disk_write = stats.get('disk_write_kbps', 0)
+        self.latest_net_rx = stats.get('net_rx_kbps', 0)
+        self.latest_net_tx = stats.get('net_tx_kbps', 0)
 
-                    self.latest_disk_read = stats.get('disk_read_kbps', 0)
-                    self.latest_disk_write = stats.get('disk_write_kbps', 0)
-                    self.latest_net_rx = stats.get('net_rx_kbps', 0)
-                    self.latest_net_tx = stats.get('net_tx_kbps', 0)
+        storage = self.app.sparkline_data.get(message.uuid) if hasattr(self.app, "sparkline_data") else None
+        if storage:
+            # Bounded deques, appending drops the oldest sample
+            storage["cpu"].append(stats["cpu_percent"])
+            storage["mem"].append(stats["mem_percent"])
+            storage["disk"].append(self.latest_disk_read + self.latest_disk_write)
+            storage["net"].append(self.latest_net_rx + self.latest_net_tx)
 
-                    # Update web console status here instead of every cycle
-                    self._update_webc_status()
+            # History is kept up to date, but off-screen cards skip the redraw
+            if self._is_on_screen():
+                self.update_sparkline_display(storage)
 
-                    if hasattr(self.app, "sparkline_data") and uuid in self.app.sparkline_data:
-                        storage = self.app.sparkline_data[uuid]
-
-                        def update_history(key, value):
-                            history = storage.get(key, [])
-                            history.append(value)
-                            if len(history) > 20:
-                                history.pop(0)
-                            storage[key] = history
-
-                        update_history("cpu", stats["cpu_percent"])
-                        update_history("mem", stats["mem_percent"])
-                        update_history("disk", self.latest_disk_read + self.latest_disk_write)
-                        update_history("net", self.latest_net_rx + self.latest_net_tx)
-
-                        self.update_sparkline_display()
-
-                self.app.call_from_thread(apply_stats_to_ui)
-
-            except libvirt.libvirtError as e:
-                if e.get_error_code() == libvirt.VIR_ERR_NO_DOMAIN and self.timer:
-                    self.timer.stop()
-                else:
-                    logging.warning(f"Libvirt error during stat update for {self.name}: {e}")
-            except Exception as e:
-                logging.error(f"Unexpected error in update_stats worker for {self.name}: {e}", exc_info=True)
-
-        self.app.worker_manager.run(update_worker, name=f"update_stats_{uuid}")
+    def _is_on_screen(self) -> bool:
+        """Returns True if the card is on the current screen and inside its visible area."""
+        try:
+            return self.screen.is_current and self.region.overlaps(self.screen.region)
+        except Exception:
+            return True
 
     @on(Click, "#top-sparkline, #bottom-sparkline")
     def toggle_stats_view(self) -> None:
@@ -483,10 +579,19 @@ class VMCard(Static):
              self.stats_view_mode = "io" if self.stats_view_mode == "resources" else "resources"
 
 
+    def _schedule_button_layout(self) -> None:
+        """Updates the button layout once status changes have settled, so that a
+        burst of transitions (e.g. Paused/Running during a migration) lays out once."""
+        if self._layout_timer:
+            self._layout_timer.stop()
+        self._layout_timer = self.set_timer(0.25, self.update_button_layout)
+
     def update_button_layout(self):
         """Update the button layout based on current VM status."""
-        rename_button = self.ui.get(ButtonIds.RENAME_BUTTON)
-        if not rename_button: return # Assume if one is missing, others might be too or we are not cached yet.
+        if self._layout_timer:
+            self._layout_timer.stop()
+            self._layout_timer = None
+        if not self.ui.get(ButtonIds.START): return # Not composed yet
 
         is_stopped = self.status == StatusText.STOPPED
         is_running = self.status == StatusText.RUNNING
@@ -494,78 +599,83 @@ class VMCard(Static):
         has_snapshots = False
         try:
             if self.vm:
-                has_snapshots = len(self.vm.listAllSnapshots(0)) > 0
+                has_snapshots = self._get_snapshot_count() > 0
         except libvirt.libvirtError as e:
             if e.get_error_code() == libvirt.VIR_ERR_NO_DOMAIN:
                 self.app.refresh_vm_list()
                 return
             logging.warning(f"Could not get snapshot count for {self.name}: {e}")
 
-        self.ui[ButtonIds.START].display = is_stopped
-        self.ui[ButtonIds.SHUTDOWN].display = is_running
-        self.ui[ButtonIds.STOP].display = is_running or is_paused
-        self.ui[ButtonIds.DELETE].display = is_running or is_paused or is_stopped
-        self.ui[ButtonIds.CLONE].display = is_stopped
-        self.ui[ButtonIds.MIGRATION].display = True
-        self.ui[ButtonIds.RENAME_BUTTON].display = is_stopped
-        self.ui[ButtonIds.PAUSE].display = is_running
-        self.ui[ButtonIds.RESUME].display = is_paused
-        self.ui[ButtonIds.CONNECT].display = (is_running or is_paused) and self.app.virt_viewer_available
-        self.ui[ButtonIds.WEB_CONSOLE].display = (is_running or is_paused) and self.graphics_type == "vnc" and self.app.websockify_available and self.app.novnc_available
-        self.ui[ButtonIds.SNAPSHOT_RESTORE].display = has_snapshots
-        self.ui[ButtonIds.SNAPSHOT_DELETE].display = has_snapshots
-        self.ui[ButtonIds.CONFIGURE_BUTTON].display = True
-
-        self.ui["cpu_container"].display = not is_stopped
-        self.ui["mem_container"].display = not is_stopped
-
-        xml_button = self.ui[ButtonIds.XML]
+        layout_key = (
+            self.status, has_snapshots, self.graphics_type,
+            self.app.virt_viewer_available, self.app.websockify_available, self.app.novnc_available,
+            self._snapshot_populated, self._special_populated,
+        )
+        if layout_key == self._layout_key:
+            return
+        self._layout_key = layout_key
+
+        target_display = {
+            ButtonIds.START: is_stopped,
+            ButtonIds.SHUTDOWN: is_running,
+            ButtonIds.STOP: is_running or is_paused,
+            ButtonIds.DELETE: is_running or is_paused or is_stopped,
+            ButtonIds.CLONE: is_stopped,
+            ButtonIds.MIGRATION: True,
+            ButtonIds.RENAME_BUTTON: is_stopped,
+            ButtonIds.PAUSE: is_running,
+            ButtonIds.RESUME: is_paused,
+            ButtonIds.CONNECT: (is_running or is_paused) and self.app.virt_viewer_available,
+            ButtonIds.WEB_CONSOLE: (is_running or is_paused) and self.graphics_type == "vnc" and self.app.websockify_available and self.app.novnc_available,
+            ButtonIds.SNAPSHOT_RESTORE: has_snapshots,
+            ButtonIds.SNAPSHOT_DELETE: has_snapshots,
+            ButtonIds.CONFIGURE_BUTTON: True,
+            "cpu_container": not is_stopped,
+            "mem_container": not is_stopped,
+        }
+        # Only touch the widgets whose visibility changes, each write invalidates the layout.
+        # Buttons of a tab that was never shown are not built yet and get skipped.
+        last_display = {}
+        for key, visible in target_display.items():
+            widget = self.ui.get(key)
+            if widget is None:
+                continue
+            if self._last_display.get(key) != visible:
+                widget.display = visible
+            last_display[key] = visible
+        self._last_display = last_display
+
         if is_stopped:
-            xml_button.label = "Edit XML"
             self.stats_view_mode = "resources" # Reset to default when stopped
-        else:
-            xml_button.label = "View XML"
+        xml_button = self.ui.get(ButtonIds.XML)
+        if xml_button:
+            xml_button.label = "Edit XML" if is_stopped else "View XML"
 
     def _update_status_styling(self):
         status_widget = self.ui.get("status")
-        if status_widget:
+        new_class = self.status.lower()
+        if status_widget and new_class != self._last_status_class:
             status_widget.remove_class("stopped", "running", "paused")
-            status_widget.add_class(self.status.lower())
+            status_widget.add_class(new_class)
+            self._last_status_class = new_class
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses."""
         from constants import VmAction
         if event.button.id == ButtonIds.START:
-            self.post_message(VmActionRequest(self.vm.UUIDString(), VmAction.START))
+            self.post_message(VmActionRequest(self.vm_uuid, VmAction.START))
             return
 
-        button_handlers = {
-            ButtonIds.SHUTDOWN: self._handle_shutdown_button,
-            ButtonIds.STOP: self._handle_stop_button,
-            ButtonIds.PAUSE: self._handle_pause_button,
-            ButtonIds.RESUME: self._handle_resume_button,
-            ButtonIds.XML: self._handle_xml_button,
-            ButtonIds.CONNECT: self._handle_connect_button,
-            ButtonIds.WEB_CONSOLE: self._handle_web_console_button,
-            ButtonIds.SNAPSHOT_TAKE: self._handle_snapshot_take_button,
-            ButtonIds.SNAPSHOT_RESTORE: self._handle_snapshot_restore_button,
-            ButtonIds.SNAPSHOT_DELETE: self._handle_snapshot_delete_button,
-            ButtonIds.DELETE: self._handle_delete_button,
-            ButtonIds.CLONE: self._handle_clone_button,
-            ButtonIds.MIGRATION: self._handle_migration_button,
-            ButtonIds.RENAME_BUTTON: self._handle_rename_button,
-            ButtonIds.CONFIGURE_BUTTON: self._handle_configure_button,
-        }
-        handler = button_handlers.get(event.button.id)
-        if handler:
-            handler(event)
+        handler_name = self._BUTTON_HANDLERS.get(event.button.id)
+        if handler_name:
+            getattr(self, handler_name)(event)
 
     def _handle_shutdown_button(self, event: Button.Pressed) -> None:
         """Handles the shutdown button press."""
         from constants import VmAction
         logging.info(f"Attempting to gracefully shutdown VM: {self.name}")
-        if self.vm.isActive():
-            self.post_message(VmActionRequest(self.vm.UUIDString(), VmAction.STOP))
+        if self.status != StatusText.STOPPED:
+            self.post_message(VmActionRequest(self.vm_uuid, VmAction.STOP))
 
     def _handle_stop_button(self, event: Button.Pressed) -> None:
         """Handles the stop button press."""
@@ -575,8 +685,8 @@ class VMCard(Static):
         def on_confirm(confirmed: bool) -> None:
             if not confirmed:
                 return
-            if self.vm.isActive():
-                self.post_message(VmActionRequest(self.vm.UUIDString(), VmAction.FORCE_OFF))
+            if self.status != StatusText.STOPPED:
+                self.post_message(VmActionRequest(self.vm_uuid, VmAction.FORCE_OFF))
 
         message = f"{ErrorMessages.HARD_STOP_WARNING}\nAre you sure you want to stop '{self.name}'?"
         self.app.push_screen(ConfirmationDialog(message), on_confirm)
@@ -585,19 +695,19 @@ class VMCard(Static):
         """Handles the pause button press."""
         from constants import VmAction
         logging.info(f"Attempting to pause VM: {self.name}")
-        if self.vm.isActive():
-            self.post_message(VmActionRequest(self.vm.UUIDString(), VmAction.PAUSE))
+        if self.status != StatusText.STOPPED:
+            self.post_message(VmActionRequest(self.vm_uuid, VmAction.PAUSE))
 
     def _handle_resume_button(self, event: Button.Pressed) -> None:
         """Handles the resume button press."""
         from constants import VmAction
         logging.info(f"Attempting to resume VM: {self.name}")
-        self.post_message(VmActionRequest(self.vm.UUIDString(), VmAction.RESUME))
+        self.post_message(VmActionRequest(self.vm_uuid, VmAction.RESUME))
 
     def _handle_xml_button(self, event: Button.Pressed) -> None:
         """Handles the xml button press."""
         try:
-            original_xml = self.vm.XMLDesc(0)
+            original_xml = self._get_xml()
             is_stopped = self.status == StatusText.STOPPED
 
             def handle_xml_modal_result(modified_xml: str | None):
@@ -606,9 +716,10 @@ class VMCard(Static):
                         try:
                             conn = self.vm.connect()
                             conn.defineXML(modified_xml)
+                            self._invalidate_xml()
                             self.app.show_success_message(f"VM '{self.name}' configuration updated successfully.")
                             logging.info(f"Successfully updated XML for VM: {self.name}")
-                            self.app.vm_service.invalidate_vm_cache(self.vm.UUIDString())
+                            self.app.vm_service.invalidate_vm_cache(self.vm_uuid)
                             self.app.refresh_vm_list()
                         except libvirt.libvirtError as e:
                             error_msg = f"Invalid XML for '{self.name}': {e}. Your changes have been discarded."
@@ -642,7 +753,11 @@ class VMCard(Static):
                 command = ["virt-viewer", "--connect", uri, domain_name]
                 logging.info(f"Executing command: {' '.join(command)}")
 
-                result = subprocess.run(command, capture_output=True, text=True, check=False)
+                # Detached from the TUI's terminal: no shared stdin, no terminal signals
+                result = subprocess.run(
+                    command, stdin=subprocess.DEVNULL, capture_output=True, text=True,
+                    check=False, start_new_session=True
+                )
 
                 if result.returncode != 0:
                     error_message = result.stderr.strip()
@@ -681,13 +796,18 @@ class VMCard(Static):
 
     def _handle_web_console_button(self, event: Button.Pressed) -> None:
         """Handles the web console button press by opening a config dialog."""
-        worker = partial(self.app.webconsole_manager.start_console, self.vm, self.conn)
+        def worker() -> None:
+            try:
+                graphics_info = self._get_graphics_info()
+            except libvirt.libvirtError:
+                graphics_info = None  # Let start_console fetch and report it
+            self.app.webconsole_manager.start_console(self.vm, self.conn, graphics_info)
 
         try:
-            uuid = self.vm.UUIDString()
+            uuid = self.vm_uuid
             if self.app.webconsole_manager.is_running(uuid):
                 self.app.worker_manager.run(
-                    worker, name=f"show_console_{self.vm.name()}"
+                    worker, name=f"show_console_{uuid}"
                 )
                 return
         except libvirt.libvirtError as e:
@@ -697,87 +817,122 @@ class VMCard(Static):
             self.app.show_error_message(f"Error checking web console status for {self.name}: {e}")
             return
 
+        def start_worker() -> None:
+            # SSH tunnel and websockify setup can take seconds, it all runs in
+            # the worker. A second click while it runs is ignored.
+            if self.app.worker_manager.is_running(f"start_console_{uuid}"):
+                return
+            self.app.show_success_message(f"Starting web console for {self.name}...")
+            self.app.worker_manager.run(
+                worker, name=f"start_console_{uuid}", exclusive=False
+            )
+
         is_remote = self.app.webconsole_manager.is_remote_connection(self.conn.getURI())
 
         if is_remote:
             def handle_dialog_result(should_start: bool) -> None:
                 if should_start:
-                    self.app.worker_manager.run(
-                        worker, name=f"start_console_{self.vm.name()}"
-                    )
+                    start_worker()
 
             self.app.push_screen(
-                WebConsoleConfigDialog(is_remote=is_remote),
+                WebConsoleConfigDialog(is_remote=is_remote, config=self.app.config),
                 handle_dialog_result
             )
         else:
-            self.app.worker_manager.run(worker, name=f"start_console_{self.vm.name()}")
+            start_worker()
+
+    def _on_snapshots_changed(self, message: str) -> None:
+        """Refreshes the card after a snapshot was created or deleted by a worker."""
+        self.app.vm_service.invalidate_vm_cache(self.vm_uuid)
+        self._invalidate_snapshots()
+        self.update_button_layout()
+        self.update_snapshot_tab_title()
+        self.app.show_success_message(message)
 
     def _handle_snapshot_take_button(self, event: Button.Pressed) -> None:
         """Handles the snapshot take button press."""
         logging.info(f"Attempting to take snapshot for VM: {self.name}")
         def handle_snapshot_result(result: dict | None) -> None:
-            if result:
-                name = result["name"]
-                description = result["description"]
+            if not result:
+                return
+            name = result["name"]
+            description = result["description"]
+
+            def do_snapshot() -> None:
                 try:
                     create_vm_snapshot(self.vm, name, description)
-                    self.app.vm_service.invalidate_vm_cache(self.vm.UUIDString())
-                    self.update_button_layout()
-                    self.app.show_success_message(f"Snapshot '{name}' created successfully.")
                 except Exception as e:
-                    self.app.show_error_message(f"Snapshot error for {self.name}: {e}")
+                    self.app.call_from_thread(self.app.show_error_message, f"Snapshot error for {self.name}: {e}")
+                    return
+                self.app.call_from_thread(self._on_snapshots_changed, f"Snapshot '{name}' created successfully.")
 
-            self.update_snapshot_tab_title()
+            self.app.worker_manager.run(do_snapshot, name=f"snapshot_take_{self.vm_uuid}")
         self.app.push_screen(SnapshotNameDialog(), handle_snapshot_result)
 
     def _handle_snapshot_restore_button(self, event: Button.Pressed) -> None:
         """Handles the snapshot restore button press."""
         logging.info(f"Attempting to restore snapshot for VM: {self.name}")
-        snapshots_info = get_vm_snapshots(self.vm)
+        snapshots_info = self._get_snapshots()
         if not snapshots_info:
             self.app.show_error_message("No snapshots to restore.")
             return
 
+        def on_restored(snapshot_name: str, new_status: str) -> None:
+            self.app.vm_service.invalidate_vm_cache(self.vm_uuid)
+            self._invalidate_xml()
+            self.apply_state(new_status)
+            self.app.show_success_message(f"Restored to snapshot '{snapshot_name}' successfully.")
+            logging.info(f"Successfully restored snapshot '{snapshot_name}' for VM: {self.name}")
+
         def restore_snapshot(snapshot_name: str | None) -> None:
-            if snapshot_name:
+            if not snapshot_name:
+                return
+
+            # Reverting a running VM can take a long time
+            def do_restore() -> None:
                 try:
                     restore_vm_snapshot(self.vm, snapshot_name)
-                    self.app.vm_service.invalidate_vm_cache(self.vm.UUIDString())
-                    self.app.show_success_message(f"Restored to snapshot '{snapshot_name}' successfully.")
-                    logging.info(f"Successfully restored snapshot '{snapshot_name}' for VM: {self.name}")
                 except Exception as e:
-                    self.app.show_error_message(f"Error on VM {self.name} during 'snapshot restore': {e}")
+                    self.app.call_from_thread(
+                        self.app.show_error_message, f"Error on VM {self.name} during 'snapshot restore': {e}"
+                    )
+                    return
+                # The snapshot may have been taken in another state than the VM's current one
+                self.app.call_from_thread(on_restored, snapshot_name, get_status(self.vm))
+
+            self.app.worker_manager.run(do_restore, name=f"snapshot_restore_{self.vm_uuid}")
 
         self.app.push_screen(SelectSnapshotDialog(snapshots_info, "Select snapshot to restore"), restore_snapshot)
 
     def _handle_snapshot_delete_button(self, event: Button.Pressed) -> None:
         """Handles the snapshot delete button press."""
         logging.info(f"Attempting to delete snapshot for VM: {self.name}")
-        snapshots_info = get_vm_snapshots(self.vm)
+        snapshots_info = self._get_snapshots()
         if not snapshots_info:
             self.app.show_error_message("No snapshots to delete.")
             return
 
         def delete_snapshot(snapshot_name: str | None) -> None:
-            if snapshot_name:
-                def on_confirm(confirmed: bool) -> None:
-                    if confirmed:
-                        try:
-                            delete_vm_snapshot(self.vm, snapshot_name)
-                            self.app.show_success_message(f"Snapshot '{snapshot_name}' deleted successfully.")
-                            self.app.vm_service.invalidate_vm_cache(self.vm.UUIDString())
-                            self.update_button_layout()
-                            logging.info(f"Successfully deleted snapshot '{snapshot_name}' for VM: {self.name}")
-                        except Exception as e:
-                            self.app.show_error_message(f"Error on VM {self.name} during 'snapshot delete': {e}")
-
-                    self.update_snapshot_tab_title()
-                self.app.push_screen(
-                    ConfirmationDialog(DialogMessages.DELETE_SNAPSHOT_CONFIRMATION.format(name=snapshot_name)), on_confirm
+            if not snapshot_name:
+                return
+
+            def do_delete() -> None:
+                try:
+                    delete_vm_snapshot(self.vm, snapshot_name)
+                except Exception as e:
+                    self.app.call_from_thread(
+                        self.app.show_error_message, f"Error on VM {self.name} during 'snapshot delete': {e}"
+                    )
+                    return
+                logging.info(f"Successfully deleted snapshot '{snapshot_name}' for VM: {self.name}")
+                self.app.call_from_thread(
+                    self._on_snapshots_changed, f"Snapshot '{snapshot_name}' deleted successfully."
                 )
 
-        self.app.push_screen(SelectSnapshotDialog(snapshots_info, "Select snapshot to delete"), delete_snapshot)
+            self.app.worker_manager.run(do_delete, name=f"snapshot_delete_{self.vm_uuid}")
+
+        # The dialog asks for the confirmation itself
+        self.app.push_screen(DeleteSnapshotDialog(snapshots_info), delete_snapshot)
 
     def _handle_delete_button(self, event: Button.Pressed) -> None:
         """Handles the delete button press."""
@@ -788,7 +943,7 @@ class VMCard(Static):
             confirmed, delete_storage = result
             if not confirmed:
                 return
-            self.post_message(VmActionRequest(self.vm.UUIDString(), VmAction.DELETE, delete_storage=delete_storage))
+            self.post_message(VmActionRequest(self.vm_uuid, VmAction.DELETE, delete_storage=delete_storage))
 
         self.app.push_screen(
             DeleteVMConfirmationDialog(self.name), on_confirm
@@ -842,7 +997,8 @@ class VMCard(Static):
                     log_callback("INFO: No Conflicting Name")
 
                 success_clones, failed_clones = [], []
-                app.call_from_thread(lambda: progress_modal.query_one("#progress-bar").update(total=count))
+                progress_bar = app.call_from_thread(progress_modal.query_one, "#progress-bar")
+                app.call_from_thread(progress_bar.update, total=count)
 
                 for i in range(1, count + 1):
                     new_name = f"{base_name}{suffix}{i}" if count > 1 else base_name
@@ -855,7 +1011,7 @@ class VMCard(Static):
                         failed_clones.append(new_name)
                         log_callback(f"ERROR: Error cloning VM {self.name} to {new_name}: {e}")
                     finally:
-                        app.call_from_thread(lambda: progress_modal.query_one("#progress-bar").advance(1))
+                        app.call_from_thread(progress_bar.advance, 1)
 
                 if success_clones:
                     msg = f"Successfully cloned to: {', '.join(success_clones)}"
@@ -886,6 +1042,8 @@ class VMCard(Static):
             def do_rename(delete_snapshots=False):
                 try:
                     rename_vm(self.vm, new_name, delete_snapshots=delete_snapshots)
+                    self._invalidate_xml()
+                    self._invalidate_snapshots()
                     msg = f"VM '{self.name}' renamed to '{new_name}' successfully."
                     if delete_snapshots:
                         msg = f"Snapshots deleted and VM '{self.name}' renamed to '{new_name}' successfully."
@@ -896,7 +1054,7 @@ class VMCard(Static):
                 except Exception as e:
                     self.app.show_error_message(f"Error renaming VM {self.name}: {e}")
 
-            num_snapshots = self.vm.snapshotNum(0)
+            num_snapshots = self._get_snapshot_count()
             if num_snapshots > 0:
                 def on_confirm_delete(confirmed: bool) -> None:
                     if confirmed:
@@ -916,7 +1074,7 @@ class VMCard(Static):
     def _handle_configure_button(self, event: Button.Pressed) -> None:
         """Handles the configure button press."""
         try:
-            self.post_message(VMNameClicked(vm_name=self.name, vm_uuid=self.vm.UUIDString()))
+            self.post_message(VMNameClicked(vm_name=self.name, vm_uuid=self.vm_uuid))
         except libvirt.libvirtError as e:
             if e.get_error_code() == libvirt.VIR_ERR_NO_DOMAIN:
                 self.app.refresh_vm_list()
@@ -984,14 +1142,14 @@ class VMCard(Static):
     def on_vm_select_checkbox_changed(self, event: Checkbox.Changed) -> None:
         """Handles when the VM selection checkbox is changed."""
         self.is_selected = event.value
-        self.post_message(VMSelectionChanged(vm_uuid=self.vm.UUIDString(), is_selected=event.value))
+        self.post_message(VMSelectionChanged(vm_uuid=self.vm_uuid, is_selected=event.value))
 
     @on(Click, "#vmname")
     def on_click_vmname(self) -> None:
         """Handle clicks on the VM name part of the VM card."""
-        self.post_message(VMNameClicked(vm_name=self.name, vm_uuid=self.vm.UUIDString()))
+        self.post_message(VMNameClicked(vm_name=self.name, vm_uuid=self.vm_uuid))
 
     @on(Click, "#cpu-mem-info")
     def on_click_cpu_mem_info(self) -> None:
         """Handle clicks on the CPU/Memory info part of the VM card."""
-        self.post_message(VMNameClicked(vm_name=self.name, vm_uuid=self.vm.UUIDString()))
+        self.post_message(VMNameClicked(vm_name=self.name, vm_uuid=self.vm_uuid))
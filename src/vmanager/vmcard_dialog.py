@@ -10,8 +10,8 @@ from textual.widgets import (
         Switch, Markdown,
         )
 from modals.base_modals import BaseDialog
-from config import load_config, save_config
-from constants import ButtonLabels, ButtonIds
+from config import save_config
+from constants import ButtonLabels, ButtonIds, DialogMessages
 
 class DeleteVMConfirmationDialog(BaseDialog[tuple[bool, bool]]):
     """A dialog to confirm VM deletion with an option to delete storage."""
@@ -51,15 +51,14 @@ class ChangeNetworkDialog(BaseDialog[dict | None]):
         super().__init__()
         self.interfaces = interfaces
         self.networks = networks
+        self._interface_options = [(f"{iface['mac']} ({iface['network']})", iface['mac']) for iface in interfaces]
+        self._network_options = [(str(net), str(net)) for net in networks]
 
     def compose(self):
-        interface_options = [(f"{iface['mac']} ({iface['network']})", iface['mac']) for iface in self.interfaces]
-        network_options = [(str(net), str(net)) for net in self.networks]
-
         with Vertical(id="dialog"):
             yield Label("Select interface and new network")
-            yield Select(interface_options, id="interface-select")
-            yield Select(network_options, id="network-select")
+            yield Select(self._interface_options, id="interface-select")
+            yield Select(self._network_options, id="network-select")
             with Horizontal(id="dialog-buttons"):
                 yield Button(ButtonLabels.CHANGE, variant="success", id=ButtonIds.CHANGE)
                 yield Button(ButtonLabels.CANCEL, variant="error", id=ButtonIds.CANCEL)
@@ -175,14 +174,15 @@ class SelectSnapshotDialog(BaseDialog[str | None]):
         super().__init__()
         self.snapshots = snapshots
         self.prompt = prompt
-
-    def compose(self):
-        items = []
-        for snap in self.snapshots:
+        self._snapshot_labels = []  # (snapshot_name, label_text)
+        for snap in snapshots:
             label_text = f"{snap['name']} ({snap['creation_time']})"
             if snap['description']:
                 label_text += f" - {snap['description']}"
-            items.append(SnapshotListItem(snap['name'], label_text))
+            self._snapshot_labels.append((snap['name'], label_text))
+
+    def compose(self):
+        items = [SnapshotListItem(name, label_text) for name, label_text in self._snapshot_labels]
 
         yield Vertical(
             Label(self.prompt),
@@ -199,6 +199,45 @@ class SelectSnapshotDialog(BaseDialog[str | None]):
         if event.button.id == ButtonIds.CANCEL:
             self.dismiss(None)
 
+class DeleteSnapshotDialog(SelectSnapshotDialog):
+    """A dialog to select a snapshot and confirm its deletion in the same screen."""
+
+    def __init__(self, snapshots: list[dict]) -> None:
+        super().__init__(snapshots, "Select snapshot to delete")
+        self._selected_name = None
+
+    def compose(self):
+        items = [SnapshotListItem(name, label_text) for name, label_text in self._snapshot_labels]
+
+        yield Vertical(
+            Label(self.prompt),
+            ListView(*items, id="snapshot-list"),
+            Label("", id="question"),
+            Horizontal(
+                Button(ButtonLabels.DELETE, variant="error", id=ButtonIds.DELETE, disabled=True),
+                Button(ButtonLabels.CANCEL, variant="primary", id=ButtonIds.CANCEL),
+                id="dialog-buttons",
+            ),
+            id="dialog",
+        )
+
+    def on_list_view_selected(self, event: ListView.Selected) -> None:
+        # Don't let SelectSnapshotDialog dismiss on selection, deletion waits for the button
+        event.prevent_default()
+        if isinstance(event.item, SnapshotListItem):
+            self._selected_name = event.item.snapshot_name
+            self.query_one("#question", Label).update(
+                DialogMessages.DELETE_SNAPSHOT_CONFIRMATION.format(name=self._selected_name)
+            )
+            self.query_one(f"#{ButtonIds.DELETE}", Button).disabled = False
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        event.prevent_default()
+        if event.button.id == ButtonIds.DELETE and self._selected_name:
+            self.dismiss(self._selected_name)
+        elif event.button.id == ButtonIds.CANCEL:
+            self.dismiss(None)
+
 class SnapshotNameDialog(BaseDialog[dict | None]):
     """A dialog to ask for a snapshot name."""
 
@@ -266,10 +305,10 @@ class WebConsoleDialog(BaseDialog[str | None]):
 class WebConsoleConfigDialog(BaseDialog[bool]):
     """A dialog to configure and start the web console."""
 
-    def __init__(self, is_remote: bool) -> None:
+    def __init__(self, is_remote: bool, config: dict) -> None:
         super().__init__()
         self.is_remote = is_remote
-        self.config = load_config()
+        self.config = config
         self.text_remote = "Run Web console on remote server. This will use a **LOT** of network bandwidth. It is recommended to **reduce quality** and enable **max compression**."
 
     def compose(self) -> ComposeResult:
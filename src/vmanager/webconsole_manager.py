@@ -5,17 +5,19 @@ import logging
 import os
 import subprocess
 import tempfile
-from datetime import datetime
+import threading
+from collections import deque
 from functools import partial
 from pathlib import Path
 from urllib.parse import urlparse
+from uuid import uuid4
 
 import libvirt
 
 from constants import AppInfo
 from config import load_config, get_log_path
-from utils import find_free_port
-from vm_queries import get_vm_graphics_info
+from utils import is_port_free
+from vm_queries import get_vm_graphics_info, _get_domain_root
 from vmcard_dialog import WebConsoleDialog
 
 
@@ -26,6 +28,17 @@ class WebConsoleManager:
         self.app = app
         self.config = load_config()
         self.processes = {}  # Replaces app.websockify_processes
+        self.ssh_masters = {}  # {user@host: {"control_socket": path, "refcount": n}}
+        self._ssh_masters_lock = threading.Lock()
+        self._ssh_host_locks = {}  # {user@host: Lock}, held while ssh commands run for that host
+        # Ports of the web console range not leased by us, checked when leased,
+        # and the ones currently leased by each VM console
+        start, end = int(app.WC_PORT_RANGE_START), int(app.WC_PORT_RANGE_END)
+        self._free_ports = deque(range(start, end + 1))
+        self._leased_ports = {}  # {uuid: [port, ...]}
+        self._ports_lock = threading.Lock()
+        self._log_fd = None  # Append-only log fd shared by the local websockify processes
+        self._tls_args = None  # websockify --cert/--key arguments, empty without a local cert
 
     @staticmethod
     def is_remote_connection(uri: str) -> bool:
@@ -39,20 +52,42 @@ class WebConsoleManager:
         )
 
 
+    def _lease_port(self, uuid: str) -> int:
+        """Takes a free port from the pool for a VM console.
+        Ports in use by another program go back to the end of the pool."""
+        with self._ports_lock:
+            for _ in range(len(self._free_ports)):
+                port = self._free_ports.popleft()
+                if is_port_free(port):
+                    self._leased_ports.setdefault(uuid, []).append(port)
+                    return port
+                self._free_ports.append(port)
+        raise IOError(
+            f"Could not find a free port in the range {self.app.WC_PORT_RANGE_START}-{self.app.WC_PORT_RANGE_END}"
+        )
+
+    def _release_ports(self, uuid: str, port: int | None = None):
+        """Returns the ports leased by a VM console to the pool, or only the given one."""
+        with self._ports_lock:
+            leased = self._leased_ports.get(uuid, [])
+            released = [port] if port in leased else ([] if port else leased[:])
+            for released_port in released:
+                leased.remove(released_port)
+                self._free_ports.append(released_port)
+            if not leased:
+                self._leased_ports.pop(uuid, None)
+
     def is_running(self, uuid: str) -> bool:
         """Check if a web console process is running for a given VM UUID."""
         if uuid in self.processes:
             proc, _, _, _, _ = self.processes[uuid]
-            if proc.poll() is None:
-                return True
-            else:
-                # Process has terminated, clean it up to prevent stale entries
-                del self.processes[uuid]
-                return False
+            # Terminated processes are cleaned up by _watch_process
+            return proc.poll() is None
         return False
 
-    def start_console(self, vm, conn):
-        """Starts a web console for a given VM."""
+    def start_console(self, vm, conn, graphics_info: dict | None = None):
+        """Starts a web console for a given VM.
+        graphics_info can be passed when the caller already has it parsed."""
         self.config = load_config()  # Reload config to get latest settings
         logging.info(f"Web console requested for VM: {vm.name()}")
         uuid = vm.UUIDString()
@@ -71,8 +106,9 @@ class WebConsoleManager:
             return
 
         try:
-            xml_content = vm.XMLDesc(0)
-            graphics_info = get_vm_graphics_info(xml_content)
+            if graphics_info is None:
+                _, root = _get_domain_root(vm)
+                graphics_info = get_vm_graphics_info(root)
 
             if graphics_info.get('type') != 'vnc':
                 self.app.call_from_thread(self.app.show_error_message, "Web console only supports VNC graphics.")
@@ -95,29 +131,79 @@ class WebConsoleManager:
                     self._launch_websockify(uuid, vm_name, vnc_target_host, vnc_target_port, ssh_info)
 
         except (libvirt.libvirtError, FileNotFoundError, Exception) as e:
+            if uuid not in self.processes:
+                self._release_ports(uuid)
             self.app.call_from_thread(self.app.show_error_message, f"Failed to start web console: {e}")
             logging.error(f"Error during web console startup for VM {vm_name}: {e}", exc_info=True)
 
     def stop_console(self, uuid: str, vm_name: str):
         """Stops the websockify process and any associated SSH tunnel."""
-        if uuid not in self.processes:
+        # Dropped before terminating so that _watch_process leaves the cleanup to us
+        process_data = self.processes.pop(uuid, None)
+        if not process_data:
             return
 
-        websockify_proc, _, _, ssh_info, _ = self.processes[uuid]
+        websockify_proc, _, _, ssh_info, _ = process_data
         websockify_proc.terminate()
 
         if ssh_info:
             self._stop_ssh_tunnel(vm_name, ssh_info)
 
-        if uuid in self.processes:
-            del self.processes[uuid]
+        self._release_ports(uuid)
         self.app.call_from_thread(self.app.show_success_message, "Web console stopped.")
 
+    def _watch_process(self, uuid: str, proc: subprocess.Popen):
+        """Waits for a console process to exit, then drops it and updates the VM card."""
+        proc.wait()
+        process_data = self.processes.get(uuid)
+        if process_data and process_data[0] is proc and self.processes.pop(uuid, None) is process_data:
+            # The process exited on its own, free its tunnel and ports
+            ssh_info = process_data[3]
+            if ssh_info:
+                self._stop_ssh_tunnel(process_data[4], ssh_info)
+            self._release_ports(uuid)
+        try:
+            self.app.call_from_thread(self._update_card_status, uuid)
+        except RuntimeError:
+            pass  # The app is shutting down
+
+    def _track_process(self, uuid: str, proc: subprocess.Popen):
+        """Updates the VM card for a new console process and watches for its exit."""
+        self.app.call_from_thread(self._update_card_status, uuid)
+        self.app.worker_manager.run(
+            partial(self._watch_process, uuid, proc),
+            name=f"watch_console_{uuid}",
+            group="webconsole_watchers",
+            exclusive=False,
+        )
+
+    def _update_card_status(self, uuid: str):
+        card = self.app.vm_cards.get(uuid)
+        if card and card.is_mounted:
+            card.update_webc_status()
+
     def terminate_all(self):
-        """Terminates all running websockify and SSH tunnel processes."""
-        for uuid, process_data in list(self.processes.items()):
-            vm_name = process_data[4]
-            self.stop_console(uuid, vm_name)
+        """Terminates all running websockify and SSH tunnel processes.
+        Called on the event loop when the app exits, so the SSH masters are
+        asked to exit without waiting for them."""
+        for process_data in list(self.processes.values()):
+            process_data[0].terminate()
+        self.processes.clear()
+
+        with self._ssh_masters_lock:
+            masters = list(self.ssh_masters.items())
+            self.ssh_masters.clear()
+        # Exiting a master also drops all of its port forwards
+        for remote_user_host, master in masters:
+            stop_cmd = ["ssh", "-S", master["control_socket"], "-O", "exit", remote_user_host]
+            try:
+                subprocess.Popen(stop_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            except FileNotFoundError:
+                logging.warning(f"Could not stop SSH master for {remote_user_host}: 'ssh' command not found.")
+
+        if self._log_fd is not None:
+            os.close(self._log_fd)
+            self._log_fd = None
 
     def _monitor_and_kill_service(self, uuid: str, vm_name: str, proc: subprocess.Popen):
         """Monitors a process's stderr for a connection and then stops it."""
@@ -127,7 +213,7 @@ class WebConsoleManager:
         try:
             for line in iter(proc.stderr.readline, ''):
                 line = line.strip()
-                logging.debug(f"websockify[{vm_name}]: {line}")
+                logging.debug("websockify[%s]: %s", vm_name, line)  # Per line, only formatted at DEBUG
 
                 if "INFO: connection from" in line:
                     logging.info(f"Web console client connected for {vm_name}. Scheduling service stop in 2 seconds.")
@@ -162,7 +248,7 @@ class WebConsoleManager:
             vnc_target_host = '127.0.0.1'
 
         # Find a free port for websockify on the remote server.
-        web_port = find_free_port(int(self.app.WC_PORT_RANGE_START), int(self.app.WC_PORT_RANGE_END))
+        web_port = self._lease_port(uuid)
         if not web_port:
             self.app.call_from_thread(self.app.show_error_message, "Could not find a free port for the web console.")
             return
@@ -228,6 +314,7 @@ class WebConsoleManager:
         url = f"{url_scheme}://{host}:{web_port}/vnc.html?path=websockify&quality={quality}&compression={compression}"
 
         self.processes[uuid] = (proc, web_port, url, {}, vm_name)
+        self._track_process(uuid, proc)
 
         stopper_worker = partial(self.stop_console, uuid, vm_name)
         def on_dialog_dismiss(result):
@@ -259,37 +346,117 @@ class WebConsoleManager:
         host = parsed_uri.hostname
         remote_user_host = f"{user}@{host}" if user else host
 
-        temp_dir = tempfile.gettempdir()
-        socket_name = f"vmanager_ssh_{uuid}_{datetime.now().strftime('%Y%m%d%H%M%S')}.sock"
-        control_socket = os.path.join(temp_dir, socket_name)
-
-        tunnel_port = find_free_port(int(self.app.WC_PORT_RANGE_START), int(self.app.WC_PORT_RANGE_END))
+        tunnel_port = self._lease_port(uuid)
         if not tunnel_port:
             self.app.call_from_thread(self.app.show_error_message, "Could not find a free port for the SSH tunnel.")
             return None, None, {}
 
-
-        ssh_cmd = [
-            "ssh", "-M", "-S", control_socket, "-f", "-N",
-            "-L", f"{tunnel_port}:{vnc_target_host}:{vnc_port}", remote_user_host
-        ]
-
+        forward_spec = f"{tunnel_port}:{vnc_target_host}:{vnc_port}"
+        control_socket = None
+        ssh_cmd = []
         try:
-            subprocess.run(ssh_cmd, check=True, timeout=10)
+            control_socket = self._acquire_ssh_master(remote_user_host)
+            ssh_cmd = ["ssh", "-S", control_socket, "-O", "forward", "-L", forward_spec, remote_user_host]
+            subprocess.run(ssh_cmd, check=True, timeout=10, capture_output=True)
             logging.info(f"SSH tunnel created for VM {vm_name} via {control_socket}")
-            return '127.0.0.1', tunnel_port, {"control_socket": control_socket}
+            return '127.0.0.1', tunnel_port, {
+                "control_socket": control_socket, "forward": forward_spec, "remote_user_host": remote_user_host
+            }
         except FileNotFoundError:
             self.app.call_from_thread(self.app.show_error_message, "SSH command not found. Cannot create tunnel.")
         except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
             self.app.call_from_thread(self.app.show_error_message, f"Failed to create SSH tunnel: {e}")
-            logging.error(f"SSH tunnel command failed: {' '.join(ssh_cmd)}")
+            logging.error(f"SSH tunnel command failed: {' '.join(ssh_cmd or e.cmd)}")
 
+        if control_socket:
+            self._release_ssh_master(remote_user_host)
+        self._release_ports(uuid, tunnel_port)
         return None, None, {}
 
+    def _acquire_ssh_master(self, remote_user_host: str) -> str:
+        """Returns the control socket of the shared SSH master connection to a host,
+        starting the master if there is none yet. Each call must be paired with
+        a _release_ssh_master call."""
+        with self._get_ssh_host_lock(remote_user_host):
+            with self._ssh_masters_lock:
+                master = self.ssh_masters.get(remote_user_host)
+            if master:
+                check_cmd = ["ssh", "-S", master["control_socket"], "-O", "check", remote_user_host]
+                if subprocess.run(check_cmd, timeout=5, capture_output=True).returncode == 0:
+                    with self._ssh_masters_lock:
+                        master["refcount"] += 1
+                    return master["control_socket"]
+                logging.warning(f"SSH master for {remote_user_host} is gone, starting a new one.")
+                with self._ssh_masters_lock:
+                    self.ssh_masters.pop(remote_user_host, None)
+
+            safe_host = remote_user_host.replace("@", "_").replace("/", "_")
+            socket_name = f"vmanager_ssh_{safe_host}_{os.getpid()}_{uuid4().hex[:8]}.sock"
+            control_socket = os.path.join(tempfile.gettempdir(), socket_name)
+
+            ssh_cmd = ["ssh", "-M", "-S", control_socket, "-f", "-N", remote_user_host]
+            subprocess.run(ssh_cmd, check=True, timeout=10)
+            logging.info(f"SSH master connection to {remote_user_host} started via {control_socket}")
+            with self._ssh_masters_lock:
+                self.ssh_masters[remote_user_host] = {"control_socket": control_socket, "refcount": 1}
+            return control_socket
+
+    def _get_ssh_host_lock(self, remote_user_host: str) -> threading.Lock:
+        """Returns the lock serializing SSH master setup and teardown for one host,
+        so a slow host doesn't hold up console starts on the others."""
+        with self._ssh_masters_lock:
+            return self._ssh_host_locks.setdefault(remote_user_host, threading.Lock())
+
+    def _release_ssh_master(self, remote_user_host: str):
+        """Drops one user of the shared SSH master to a host, and closes the
+        master when it was the last one."""
+        # The host lock is kept while the master exits, so a new master for
+        # the same host is only started once this one is gone
+        with self._get_ssh_host_lock(remote_user_host):
+            with self._ssh_masters_lock:
+                master = self.ssh_masters.get(remote_user_host)
+                if not master:
+                    return
+                master["refcount"] -= 1
+                if master["refcount"] > 0:
+                    return
+                del self.ssh_masters[remote_user_host]
+
+            control_socket = master["control_socket"]
+            try:
+                stop_cmd = ["ssh", "-S", control_socket, "-O", "exit", remote_user_host]
+                subprocess.run(stop_cmd, check=True, timeout=5, capture_output=True)
+                logging.info(f"SSH master connection to {remote_user_host} stopped")
+            except FileNotFoundError:
+                self.app.call_from_thread(self.app.show_error_message, "'ssh' command not found.")
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+                logging.warning(f"Could not stop SSH master for {remote_user_host} cleanly: {e.stderr.decode() if e.stderr else e}")
+            finally:
+                if os.path.exists(control_socket):
+                    os.remove(control_socket)
+
+
+    def _get_log_fd(self) -> int:
+        """Opens the app log file for websockify output on first use and keeps it open."""
+        if self._log_fd is None:
+            self._log_fd = os.open(get_log_path(), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        return self._log_fd
+
+    def _get_tls_args(self) -> list[str]:
+        """Checks once for the local cert and key, which are generated at app startup."""
+        if self._tls_args is None:
+            config_dir = Path.home() / '.config' / AppInfo.name
+            cert_file = config_dir / 'cert.pem'
+            key_file = config_dir / 'key.pem'
+            if cert_file.is_file() and key_file.is_file():
+                self._tls_args = ["--cert", str(cert_file), "--key", str(key_file)]
+            else:
+                self._tls_args = []
+        return self._tls_args
 
     def _launch_websockify(self, uuid: str, vm_name: str, host: str, port: int, ssh_info: dict):
         """Launches the websockify process and shows the console dialog."""
-        web_port = find_free_port(int(self.app.WC_PORT_RANGE_START), int(self.app.WC_PORT_RANGE_END))
+        web_port = self._lease_port(uuid)
         if not web_port:
             self.app.call_from_thread(self.app.show_error_message, "Could not find a free port for the web console.")
             return
@@ -302,49 +469,46 @@ class WebConsoleManager:
             f"{host}:{port}", "--web", novnc_path
         ]
 
-        config_dir = Path.home() / '.config' / AppInfo.name
-        cert_file = config_dir / 'cert.pem'
-        key_file = config_dir / 'key.pem'
         url_scheme = "http"
 
-        log_file_path = get_log_path()
-        with open(log_file_path, 'a') as log_file_handle:
-            if cert_file.exists() and key_file.exists():
-                websockify_cmd.extend(["--cert", str(cert_file), "--key", str(key_file)])
-                url_scheme = "https"
-                self.app.call_from_thread(self.app.show_success_message, "Found cert/key, using secure wss connection.")
+        tls_args = self._get_tls_args()
+        if tls_args:
+            websockify_cmd.extend(tls_args)
+            url_scheme = "https"
+            self.app.call_from_thread(self.app.show_success_message, "Found cert/key, using secure wss connection.")
 
-            proc = subprocess.Popen(websockify_cmd, stdout=subprocess.DEVNULL, stderr=log_file_handle)
+        proc = subprocess.Popen(websockify_cmd, stdout=subprocess.DEVNULL, stderr=self._get_log_fd())
 
-            url = f"{url_scheme}://localhost:{web_port}/vnc.html?path=websockify"
-            self.processes[uuid] = (proc, web_port, url, ssh_info, vm_name)
+        url = f"{url_scheme}://localhost:{web_port}/vnc.html?path=websockify"
+        self.processes[uuid] = (proc, web_port, url, ssh_info, vm_name)
+        self._track_process(uuid, proc)
 
-            stopper_worker = partial(self.stop_console, uuid, vm_name)
-            def on_dialog_dismiss(result):
-                if result == "stop":
-                    self.app.worker_manager.run(
-                        stopper_worker, name=f"stop_console_{uuid}"
-                    )
+        stopper_worker = partial(self.stop_console, uuid, vm_name)
+        def on_dialog_dismiss(result):
+            if result == "stop":
+                self.app.worker_manager.run(
+                    stopper_worker, name=f"stop_console_{uuid}"
+                )
 
-            self.app.call_from_thread(
-                self.app.push_screen,
-                WebConsoleDialog(url),
-                on_dialog_dismiss
-            )
+        self.app.call_from_thread(
+            self.app.push_screen,
+            WebConsoleDialog(url),
+            on_dialog_dismiss
+        )
 
     def _stop_ssh_tunnel(self, vm_name: str, ssh_info: dict):
-        """Stops the SSH tunnel using its control socket."""
+        """Cancels the VM's port forward and releases the shared SSH master."""
         control_socket = ssh_info.get("control_socket")
-        if not control_socket:
+        remote_user_host = ssh_info.get("remote_user_host")
+        if not control_socket or not remote_user_host:
             return
         try:
-            stop_cmd = ["ssh", "-S", control_socket, "-O", "exit", "dummy-host"]
-            subprocess.run(stop_cmd, check=True, timeout=5, capture_output=True)
+            cancel_cmd = ["ssh", "-S", control_socket, "-O", "cancel", "-L", ssh_info["forward"], remote_user_host]
+            subprocess.run(cancel_cmd, check=True, timeout=5, capture_output=True)
             logging.info(f"SSH tunnel stopped for VM {vm_name} using socket {control_socket}")
         except FileNotFoundError:
             self.app.call_from_thread(self.app.show_error_message, "'ssh' command not found.")
         except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
             logging.warning(f"Could not stop SSH tunnel cleanly for VM {vm_name}: {e.stderr.decode() if e.stderr else e}")
         finally:
-            if os.path.exists(control_socket):
-                os.remove(control_socket)
+            self._release_ssh_master(remote_user_host)